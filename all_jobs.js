@@ -9,6 +9,7 @@
 let _ajJobs = [];        // current page of jobs
 let _ajTotal = 0;        // total in DB
 let _ajOffset = 0;       // current query offset
+let _ajCursor = null;    // keyset cursor (nextBefore) for the next DB page
 let _ajApiOffset = 0;    // next API offset for load-more from AACP
 let _ajGrouped = false;  // group-by-flow toggle
 let _ajHasMore = true;   // more pages available from API
@@ -138,11 +139,20 @@ async function ajQueryJobs(append = false) {
         return;
     }
 
-    if (!append) _ajOffset = 0;
+    if (!append) {
+        _ajOffset = 0;
+        _ajCursor = null;
+    }
+
+    // Append pages seek past the last row shown, so jobs sharing a timestamp
+    // or inserted meanwhile don't shift rows between pages
+    const page = append && _ajCursor
+        ? `before=${encodeURIComponent(_ajCursor)}`
+        : `offset=${_ajOffset}`;
 
     try {
         const resp = await fetch(
-            `${API_BASE}/api/all-jobs?offset=${_ajOffset}&limit=50&${filters}`
+            `${API_BASE}/api/all-jobs?${page}&limit=50&${filters}`
         );
         const data = await resp.json();
         if (data.error) throw new Error(data.error);
@@ -154,6 +164,7 @@ async function ajQueryJobs(append = false) {
         }
         _ajTotal = data.total || 0;
         _ajHasDbMore = data.hasMore || false;
+        _ajCursor = data.nextBefore || null;
 
         _ajRenderFlat(_ajJobs);
 
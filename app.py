@@ -8,15 +8,26 @@ Serves the web UI and provides endpoints to:
   - Read/update configuration (tokens masked on read)
 """
 
-import json
+import functools
+import heapq
+import logging
+import math
 import os
-import subprocess
+import queue
+import re
+import stat
 import sys
+import tempfile
+import threading
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, request, send_from_directory
+from flask_compress import Compress
 from flask_cors import CORS
+import orjson
 
 from config import Config
 from platform_api import PlatformAPI, PlatformAPIError
@@ -25,9 +36,16 @@ from dbfs_eventlog import download_eventlog, EventLogError
 import flow_store  # kept for eventlog_dir and list_analyzed_jobs (file-based)
 import db
 
+log = logging.getLogger(__name__)
+
 app = Flask(__name__, static_folder=".", static_url_path="")
 CORS(app)
 
+# Compress JSON/static responses (analysis payloads shrink 5-10x); negotiated via Accept-Encoding
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 1024
+Compress(app)
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -35,6 +53,32 @@ CORS(app)
 ENV_FILE = Path(__file__).resolve().parent / ".env"
 LEGACY_JOBS_DIR = Path(__file__).resolve().parent / "jobs"
 ANALYZER_SCRIPT = Path(__file__).resolve().parent / "eventlog-analyzer" / "analyze_eventlog.py"
+ANALYZER_TIMEOUT_S = 120
+
+# The analyzer lives in a hyphenated directory, so put it on the path and import
+# it once rather than spawning a new interpreter per request
+sys.path.insert(0, str(ANALYZER_SCRIPT.parent))
+import analyze_eventlog  # noqa: E402
+
+# Shared pool for independent outbound HTTP calls made within a single request
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tri-io")
+
+# Max concurrent Databricks lookups for /api/databricks/batch. Shared across
+# requests so its threads (and their thread-local SQLite connections) persist
+DBX_BATCH_WORKERS = 8
+_DBX_POOL = ThreadPoolExecutor(max_workers=DBX_BATCH_WORKERS, thread_name_prefix="tri-dbx")
+
+# Event log analysis is CPU-heavy; keep it off the I/O pool
+_ANALYZER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tri-analyzer")
+
+# jobRunIds with a download or analysis in progress. An in-process analysis
+# can't be killed on timeout, so a retry must not re-download (truncating the
+# eventlog the running analysis reads) or start a second analysis.
+_EVENTLOG_IN_FLIGHT: set[str] = set()
+_EVENTLOG_IN_FLIGHT_LOCK = threading.Lock()
+
+# Cache writes are drained by one background thread so responses don't wait on disk
+_WRITE_QUEUE: queue.Queue = queue.Queue()
 
 # Keys we allow to be read/written through the config API
 CONFIGURABLE_KEYS = [
@@ -54,45 +98,117 @@ CONFIGURABLE_KEYS = [
 SECRET_KEYS = {"PLATFORM_API_TOKEN", "ONPREM_API_TOKEN", "DATABRICKS_TOKEN"}
 
 
+def _writer_loop():
+    while True:
+        func, args = _WRITE_QUEUE.get()
+        try:
+            func(*args)
+        except Exception:
+            log.exception(f"Background write {func.__name__} failed")
+        finally:
+            _WRITE_QUEUE.task_done()
+
+
+threading.Thread(target=_writer_loop, name="tri-cache-writer", daemon=True).start()
+
+
+def enqueue_write(func, *args):
+    """Run a persistence call on the background writer (FIFO, errors are logged).
+
+    args must not be mutated after enqueueing.
+    """
+    _WRITE_QUEUE.put((func, args))
+
+
+def json_response(obj):
+    """Serialize obj with orjson into a JSON response (replacement for jsonify)."""
+    return app.response_class(
+        orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS),
+        mimetype="application/json",
+    )
+
+
+def request_json() -> dict:
+    """Parse the request body as JSON; empty or malformed bodies yield {}."""
+    try:
+        return orjson.loads(request.get_data(cache=True)) or {}
+    except orjson.JSONDecodeError:
+        return {}
+
+
 def mask_value(value: str) -> str:
-    """Mask a secret value, showing only the last 4 characters."""
+    """Mask a secret value, showing only the last 4 characters.
+
+    The mask is fixed-width so the response doesn't reveal the secret's length.
+    """
     if not value or len(value) <= 4:
         return "••••"
-    return "•" * (len(value) - 4) + value[-4:]
+    return "••••••••" + value[-4:]
+
+
+_ENV_CACHE = {"mtime": 0, "data": {}}
+
+# KEY=VALUE lines only — comments and blank lines never match the anchor
+_ENV_RE = re.compile(rb"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$")
 
 
 def read_env_file() -> dict:
-    """Read .env file into a dict (key=value lines only)."""
-    env = {}
-    if ENV_FILE.exists():
-        for line in ENV_FILE.read_text().splitlines():
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#") and "=" in stripped:
-                key, _, value = stripped.partition("=")
-                env[key.strip()] = value.strip()
+    """Read .env file into a dict (key=value lines only).
+
+    The parsed dict is cached until the file's mtime changes; callers must not mutate it.
+    """
+    try:
+        mtime = ENV_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if mtime == _ENV_CACHE["mtime"]:
+        return _ENV_CACHE["data"]
+
+    env = {
+        m.group(1).decode(): m.group(2).decode()
+        for m in _ENV_RE.finditer(ENV_FILE.read_bytes())
+    }
+    _ENV_CACHE["data"] = env
+    _ENV_CACHE["mtime"] = mtime
     return env
 
 
 def write_env_file(updates: dict):
-    """Update specific keys in the .env file, preserving comments & order."""
-    lines = ENV_FILE.read_text().splitlines() if ENV_FILE.exists() else []
+    """Update specific keys in the .env file, preserving comments & order.
+
+    Lines are streamed into a temp file next to .env which then replaces it
+    atomically, so concurrent readers never see a half-written file.
+    """
     updated_keys = set()
-    new_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped and not stripped.startswith("#") and "=" in stripped:
-            key, _, _ = stripped.partition("=")
-            key = key.strip()
-            if key in updates:
-                new_lines.append(f"{key}={updates[key]}")
-                updated_keys.add(key)
-                continue
-        new_lines.append(line)
-    # Append any keys not already in the file
-    for key, value in updates.items():
-        if key not in updated_keys:
-            new_lines.append(f"{key}={value}")
-    ENV_FILE.write_text("\n".join(new_lines) + "\n")
+    fd, tmp_path = tempfile.mkstemp(dir=ENV_FILE.parent, prefix=".env.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as out:
+            if ENV_FILE.exists():
+                os.chmod(tmp_path, stat.S_IMODE(ENV_FILE.stat().st_mode))
+                with open(ENV_FILE, "r") as src:
+                    for line in src:
+                        line = line.rstrip("\r\n")
+                        stripped = line.strip()
+                        if stripped and not stripped.startswith("#") and "=" in stripped:
+                            key, _, _ = stripped.partition("=")
+                            key = key.strip()
+                            if key in updates:
+                                out.write(f"{key}={updates[key]}\n")
+                                updated_keys.add(key)
+                                continue
+                        out.write(line + "\n")
+            # Append any keys not already in the file
+            for key, value in updates.items():
+                if key not in updated_keys:
+                    out.write(f"{key}={value}\n")
+        os.replace(tmp_path, ENV_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _ENV_CACHE["mtime"] = 0
 
 
 def reload_config():
@@ -111,48 +227,68 @@ def reload_config():
     Config.MATCH_WINDOW_MINUTES = int(os.getenv("MATCH_WINDOW_MINUTES", "10"))
 
 
+_fromiso = datetime.fromisoformat
+
+
 def parse_iso(ts: str) -> datetime | None:
     """Parse an ISO timestamp string to datetime."""
     if not ts:
         return None
+    # Handle '2026-01-29T19:32:42.000Z' format (fromisoformat only accepts 'Z' on 3.11+)
+    if ts.endswith("Z"):
+        ts = ts[:-1] + "+00:00"
     try:
-        # Handle '2026-01-29T19:32:42.000Z' format
-        return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-    except (ValueError, TypeError):
+        return _fromiso(ts)
+    except ValueError:
         return None
 
 
-def compute_execution_minutes(created_at: str, updated_at: str) -> float | None:
-    """Compute execution time in minutes between created and updated."""
-    dt_created = parse_iso(created_at)
-    dt_updated = parse_iso(updated_at)
-    if dt_created and dt_updated:
-        delta = (dt_updated - dt_created).total_seconds() / 60.0
-        return round(delta, 1)
-    return None
+def parse_iso_epoch(ts: str) -> float | None:
+    """Parse an ISO timestamp string to epoch seconds.
+
+    Callers only ever subtract timestamps, so a float avoids datetime/timedelta
+    arithmetic on the hot paths.
+    """
+    dt = parse_iso(ts)
+    return dt.timestamp() if dt else None
+
+
+def has_analysis(analysis_file: Path) -> bool:
+    """True if analysis_file exists and is non-empty.
+
+    analysis_response splices the file in unparsed, so an empty file (left by
+    an interrupted write before the analyzer wrote atomically) counts as missing.
+    """
+    try:
+        return analysis_file.stat().st_size > 0
+    except OSError:
+        return False
+
+
+def analysis_response(analysis_file: Path, **envelope):
+    """Return analysis.json inside a JSON envelope without re-parsing it.
+
+    The file is already valid JSON, so its bytes are spliced in as the
+    "analysis" value. The ETag comes from (mtime, size) so repeat views get a 304.
+    """
+    st = analysis_file.stat()
+    head = orjson.dumps(envelope)[:-1] + b',"analysis":'
+    resp = app.response_class(head + analysis_file.read_bytes() + b"}", mimetype="application/json")
+    resp.set_etag(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+    return resp.make_conditional(request)
 
 
 def extract_job_summary(job_data: dict) -> dict:
     """Extract the fields we care about from a jobLibrary API entry."""
-    created_at = job_data.get("createdAt", "")
-    updated_at = job_data.get("updatedAt", "")
-
-    flow_id = None
-    flow_name = None
-    wd = job_data.get("wrangledDataset")
-    if wd:
-        flow = wd.get("flow")
-        if flow:
-            flow_id = flow.get("id")
-            flow_name = flow.get("name")
+    get = job_data.get
+    created_at = get("createdAt", "")
+    updated_at = get("updatedAt", "")
+
+    flow = (get("wrangledDataset") or {}).get("flow") or {}
 
     # The inner job details (executionLanguage, cpJobId) live inside jobs.data[0]
-    inner_job = None
-    jobs_wrapper = job_data.get("jobs")
-    if jobs_wrapper:
-        jobs_list = jobs_wrapper.get("data", [])
-        if jobs_list:
-            inner_job = jobs_list[0]
+    jobs_list = (get("jobs") or {}).get("data") or ()
+    inner_job = jobs_list[0] if jobs_list else None
 
     execution_language = None
     databricks_job_id = None
@@ -160,71 +296,117 @@ def extract_job_summary(job_data: dict) -> dict:
         execution_language = inner_job.get("executionLanguage")
         # Parse databricksJobId from cpJobId JSON string
         cp_job_id_raw = inner_job.get("cpJobId")
-        if cp_job_id_raw and isinstance(cp_job_id_raw, str):
+        if cp_job_id_raw:
             try:
-                cp_job = json.loads(cp_job_id_raw)
-                databricks_job_id = cp_job.get("databricksJobId")
-            except (json.JSONDecodeError, TypeError):
+                databricks_job_id = orjson.loads(cp_job_id_raw).get("databricksJobId")
+            except (orjson.JSONDecodeError, TypeError, AttributeError):
                 pass
 
-    # Extract ranfor, ranfrom, and creator email (API uses lowercase keys)
-    ran_for = job_data.get("ranfor", "")
-    ran_from = job_data.get("ranfrom", "")
+    # Creator email may be in updater or creator object (API uses lowercase keys)
     creator_email = ""
-    # creator email may be in updater or creator object
-    updater = job_data.get("updater")
-    if updater and isinstance(updater, dict):
+    updater = get("updater")
+    if isinstance(updater, dict):
         creator_email = updater.get("email", "")
     if not creator_email:
-        creator = job_data.get("creator")
-        if creator and isinstance(creator, dict):
+        creator = get("creator")
+        if isinstance(creator, dict):
             creator_email = creator.get("email", "")
 
+    # Execution time in minutes between created and updated
+    t_created = parse_iso_epoch(created_at)
+    execution_minutes = None
+    if t_created is not None and updated_at:
+        t_updated = parse_iso_epoch(updated_at)
+        if t_updated is not None:
+            execution_minutes = round((t_updated - t_created) / 60.0, 1)
+
+    job_id = get("id")
     return {
-        "jobRunId": job_data.get("id"),
-        "jobGroupId": job_data.get("id"),
-        "status": job_data.get("status"),
-        "flowId": flow_id,
-        "flowName": flow_name,
-        "ranFor": ran_for,
-        "ranFrom": ran_from,
+        "jobRunId": job_id,
+        "jobGroupId": job_id,
+        "status": get("status"),
+        "flowId": flow.get("id"),
+        "flowName": flow.get("name"),
+        "ranFor": get("ranfor", ""),
+        "ranFrom": get("ranfrom", ""),
         "creatorEmail": creator_email,
         "createdAt": created_at,
         "updatedAt": updated_at,
-        "executionTimeMinutes": compute_execution_minutes(created_at, updated_at),
+        "executionTimeMinutes": execution_minutes,
         "executionLanguage": execution_language,
         "databricksJobId": databricks_job_id,
+        # Parsed createdAt for match_jobs, which pops it so it is never stored or returned
+        "_createdEpoch": t_created,
     }
 
 
+_UNPARSED = object()
+
+
+def _created_epoch(job: dict) -> float | None:
+    """Take the pre-parsed createdAt from a job summary, parsing only if absent."""
+    ts = job.pop("_createdEpoch", _UNPARSED)
+    if ts is _UNPARSED:
+        return parse_iso_epoch(job.get("createdAt", ""))
+    return ts
+
+
 def match_jobs(aac_jobs: list[dict], onprem_jobs: list[dict], window_minutes: int = 10) -> list[dict]:
     """
     Match AAC and on-prem jobs by createdAt within ±window_minutes.
-    Returns a list of paired rows.
+
+    Candidate pairs inside the window are resolved closest-first, so each
+    on-prem job goes to the AAC job nearest in time rather than to whichever
+    AAC job happened to be scanned first.
+    Returns a list of paired rows (AAC order, then unmatched on-prem jobs).
+    Consumes the internal "_createdEpoch" field of each job summary.
     """
+    window_seconds = window_minutes * 60
+
+    # Parse each timestamp once up front (epoch seconds) instead of per comparison
+    op_sorted = sorted(
+        (ts, idx)
+        for idx, ts in enumerate(_created_epoch(op) for op in onprem_jobs)
+        if ts is not None
+    )
+    op_times = [ts for ts, _ in op_sorted]
+
+    # Nothing to pair against (e.g. on-prem disabled) — skip the candidate search
+    if not op_times:
+        for aac in aac_jobs:
+            aac.pop("_createdEpoch", None)
+        return (
+            [{"aac": aac, "onprem": None, "matched": False} for aac in aac_jobs]
+            + [{"aac": None, "onprem": op, "matched": False} for op in onprem_jobs]
+        )
+
+    # Collect every (delta, aac_idx, op_idx) within the window via bisect on the sorted times
+    candidates = []
+    for a_idx, aac in enumerate(aac_jobs):
+        aac_ts = _created_epoch(aac)
+        if aac_ts is None:
+            continue
+        lo = bisect_left(op_times, aac_ts - window_seconds)
+        hi = bisect_right(op_times, aac_ts + window_seconds)
+        for op_ts, o_idx in op_sorted[lo:hi]:
+            candidates.append((abs(aac_ts - op_ts), a_idx, o_idx))
+
+    # Resolve greedily by ascending delta
+    heapq.heapify(candidates)
+    aac_match: dict[int, int] = {}
     used_onprem = set()
-    pairs = []
+    while candidates:
+        _, a_idx, o_idx = heapq.heappop(candidates)
+        if a_idx in aac_match or o_idx in used_onprem:
+            continue
+        aac_match[a_idx] = o_idx
+        used_onprem.add(o_idx)
 
-    for aac in aac_jobs:
-        aac_dt = parse_iso(aac.get("createdAt", ""))
-        best_match = None
-        best_delta = None
-
-        if aac_dt:
-            for idx, op in enumerate(onprem_jobs):
-                if idx in used_onprem:
-                    continue
-                op_dt = parse_iso(op.get("createdAt", ""))
-                if op_dt:
-                    delta = abs((aac_dt - op_dt).total_seconds())
-                    if delta <= window_minutes * 60:
-                        if best_delta is None or delta < best_delta:
-                            best_match = idx
-                            best_delta = delta
-
-        if best_match is not None:
-            used_onprem.add(best_match)
-            pairs.append({"aac": aac, "onprem": onprem_jobs[best_match], "matched": True})
+    pairs = []
+    for a_idx, aac in enumerate(aac_jobs):
+        o_idx = aac_match.get(a_idx)
+        if o_idx is not None:
+            pairs.append({"aac": aac, "onprem": onprem_jobs[o_idx], "matched": True})
         else:
             pairs.append({"aac": aac, "onprem": None, "matched": False})
 
@@ -236,6 +418,62 @@ def match_jobs(aac_jobs: list[dict], onprem_jobs: list[dict], window_minutes: in
     return pairs
 
 
+@functools.lru_cache(maxsize=8)
+def base_host(url: str) -> str:
+    """Strip the /v4 suffix from an API URL to get the host used for job links."""
+    return url.rstrip("/").removesuffix("/v4").removesuffix("/v4/") if url else ""
+
+
+@functools.lru_cache(maxsize=8)
+def platform_client(token: str, base_url: str, verify_ssl: bool = True) -> PlatformAPI:
+    """Return a shared PlatformAPI client for these settings.
+
+    Reusing the client keeps its session's keep-alive connections warm across
+    requests, so repeat calls skip the TCP/TLS handshake. A config change
+    produces a new key and therefore a new client.
+    """
+    return PlatformAPI(token=token, base_url=base_url, verify_ssl=verify_ssl)
+
+
+def fetch_flow_job_summaries(
+    token: str, base_url: str, flow_name: str, limit: int, verify_ssl: bool = True
+) -> list[dict]:
+    """Fetch a flow's jobs from one environment and summarize them.
+
+    Runs on _IO_POOL so the summary parsing overlaps the other environment's I/O.
+    Raises PlatformAPIError on failure.
+    """
+    api = platform_client(token, base_url, verify_ssl)
+    response = api.get_jobs_for_flow(flow_name, limit=limit)
+    return [extract_job_summary(j) for j in response.get("data", [])]
+
+
+def fetch_dbx_details(dbx: DatabricksClient, dbx_job_id, host: str) -> dict:
+    """Fetch run details and cluster events for a Databricks run.
+
+    Returns the /api/databricks payload. Raises DatabricksClientError if the
+    run lookup fails; a cluster events failure is reported inside runDetails.
+    """
+    run_details = dbx.get_run_details(dbx_job_id)
+
+    # Fetch cluster events if we got a cluster_id
+    cluster_events = []
+    cluster_id = run_details.get("clusterId")
+    if cluster_id:
+        try:
+            cluster_events = dbx.get_cluster_events(cluster_id)
+        except DatabricksClientError as e:
+            run_details["clusterEventsError"] = str(e)
+
+    return {
+        "databricksJobId": dbx_job_id,
+        "databricksHost": host,
+        "runDetails": run_details,
+        "clusterEvents": cluster_events,
+        "cached": False,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Routes
 # ---------------------------------------------------------------------------
@@ -248,59 +486,59 @@ def serve_index():
 @app.route("/api/jobs", methods=["POST"])
 def fetch_jobs():
     """Fetch jobs from both environments and return matched pairs."""
-    body = request.get_json(silent=True) or {}
+    # Snapshot config once so a concurrent PUT /api/config can't mix old and new values
+    aac_url, aac_token = Config.PLATFORM_API_BASE_URL, Config.PLATFORM_API_TOKEN
+    onprem_url, onprem_token = Config.ONPREM_API_BASE_URL, Config.ONPREM_API_TOKEN
+    onprem_enabled = getattr(Config, 'ONPREM_ENABLED', True)
+    window = Config.MATCH_WINDOW_MINUTES
+
+    body = request_json()
     flow_name = body.get("flowName", "").strip()
     limit = body.get("limit", Config.DEFAULT_LIMIT)
 
     if not flow_name:
-        return jsonify({"error": "flowName is required"}), 400
+        return json_response({"error": "flowName is required"}), 400
 
     results = {"flowName": flow_name, "aac": [], "onprem": [], "pairs": []}
     errors = []
 
-    # Strip /v4 suffix to get the base host URL for job links
-    def base_host(url: str) -> str:
-        return url.rstrip("/").removesuffix("/v4").removesuffix("/v4/")
+    # Fetch AAC and on-prem jobs concurrently — the two HTTP calls are independent
+    aac_future = None
+    if aac_token and aac_url:
+        aac_future = _IO_POOL.submit(
+            fetch_flow_job_summaries, aac_token, aac_url, flow_name, limit,
+        )
+
+    # On-prem only if enabled
+    onprem_future = None
+    if onprem_enabled and onprem_token and onprem_url:
+        onprem_future = _IO_POOL.submit(
+            fetch_flow_job_summaries, onprem_token, onprem_url, flow_name, limit,
+            verify_ssl=False,
+        )
 
-    # Fetch AAC jobs
-    if Config.PLATFORM_API_TOKEN and Config.PLATFORM_API_BASE_URL:
+    if aac_future is not None:
         try:
-            aac_api = PlatformAPI(
-                token=Config.PLATFORM_API_TOKEN,
-                base_url=Config.PLATFORM_API_BASE_URL,
-            )
-            aac_response = aac_api.get_jobs_for_flow(flow_name, limit=limit)
-            aac_data = aac_response.get("data", [])
-            results["aac"] = [extract_job_summary(j) for j in aac_data]
+            results["aac"] = aac_future.result()
         except PlatformAPIError as e:
             errors.append(f"AAC: {e}")
     else:
         errors.append("AAC: Missing PLATFORM_API_BASE_URL or PLATFORM_API_TOKEN")
 
-    # Fetch on-prem jobs (only if enabled)
-    onprem_enabled = getattr(Config, 'ONPREM_ENABLED', True)
-    if onprem_enabled and Config.ONPREM_API_TOKEN and Config.ONPREM_API_BASE_URL:
+    if onprem_future is not None:
         try:
-            onprem_api = PlatformAPI(
-                token=Config.ONPREM_API_TOKEN,
-                base_url=Config.ONPREM_API_BASE_URL,
-                verify_ssl=False,
-            )
-            onprem_response = onprem_api.get_jobs_for_flow(flow_name, limit=limit)
-            onprem_data = onprem_response.get("data", [])
-            results["onprem"] = [extract_job_summary(j) for j in onprem_data]
+            results["onprem"] = onprem_future.result()
         except PlatformAPIError as e:
             errors.append(f"On-Prem: {e}")
     elif onprem_enabled:
         errors.append("On-Prem: Missing ONPREM_API_BASE_URL or ONPREM_API_TOKEN")
 
     # Match jobs using configurable window
-    window = Config.MATCH_WINDOW_MINUTES
     new_pairs = match_jobs(results["aac"], results["onprem"], window_minutes=window)
 
     # Build metadata for storage
-    aac_base = base_host(Config.PLATFORM_API_BASE_URL) if Config.PLATFORM_API_BASE_URL else ""
-    onprem_base = base_host(Config.ONPREM_API_BASE_URL) if Config.ONPREM_API_BASE_URL else ""
+    aac_base = base_host(aac_url)
+    onprem_base = base_host(onprem_url)
     metadata = {
         "aacBaseUrl": aac_base,
         "onpremBaseUrl": onprem_base,
@@ -323,121 +561,139 @@ def fetch_jobs():
     results["analyzedJobs"] = flow_store.list_analyzed_jobs(flow_name)
     results["dbxCachedJobs"] = db.list_dbx_cached_jobs(flow_name)
 
-    return jsonify(results)
+    return json_response(results)
 
 
 @app.route("/api/databricks", methods=["POST"])
 def fetch_databricks_details():
     """Fetch Databricks run details and cluster events for a given run ID."""
-    body = request.get_json(silent=True) or {}
+    dbx_host, dbx_token = Config.DATABRICKS_HOST, Config.DATABRICKS_TOKEN
+    body = request_json()
     dbx_job_id = body.get("databricksJobId")
     flow_name = body.get("flowName", "").strip()
     job_run_id = body.get("jobRunId")
     if not dbx_job_id:
-        return jsonify({"error": "databricksJobId is required"}), 400
+        return json_response({"error": "databricksJobId is required"}), 400
 
     # Check cache first
     if flow_name and job_run_id:
         cached = db.load_dbx(flow_name, str(job_run_id))
         if cached:
             cached["cached"] = True
-            return jsonify(cached)
+            return json_response(cached)
 
-    if not Config.DATABRICKS_HOST or not Config.DATABRICKS_TOKEN:
-        return jsonify({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
+    if not dbx_host or not dbx_token:
+        return json_response({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
 
     try:
-        dbx = DatabricksClient(host=Config.DATABRICKS_HOST, token=Config.DATABRICKS_TOKEN)
-        run_details = dbx.get_run_details(dbx_job_id)
-
-        # Fetch cluster events if we got a cluster_id
-        cluster_events = []
-        cluster_id = run_details.get("clusterId")
-        if cluster_id:
-            try:
-                cluster_events = dbx.get_cluster_events(cluster_id)
-            except DatabricksClientError as e:
-                run_details["clusterEventsError"] = str(e)
-
-        response_data = {
-            "databricksJobId": dbx_job_id,
-            "databricksHost": Config.DATABRICKS_HOST,
-            "runDetails": run_details,
-            "clusterEvents": cluster_events,
-            "cached": False,
-        }
+        dbx = DatabricksClient(host=dbx_host, token=dbx_token)
+        response_data = fetch_dbx_details(dbx, dbx_job_id, dbx_host)
 
         # Save to cache
         if flow_name and job_run_id:
-            db.save_dbx(flow_name, str(job_run_id), response_data)
+            enqueue_write(db.save_dbx, flow_name, str(job_run_id), response_data)
 
-        return jsonify(response_data)
+        return json_response(response_data)
     except DatabricksClientError as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
+
+
+@app.route("/api/databricks/batch", methods=["POST"])
+def fetch_databricks_details_batch():
+    """Fetch Databricks details for several runs concurrently.
+
+    Body: {"jobs": [{"databricksJobId", "flowName", "jobRunId"}, ...]}
+    Returns {"results": {databricksJobId: payload}}; a failed run's payload is {"error": ...}.
+    """
+    dbx_host, dbx_token = Config.DATABRICKS_HOST, Config.DATABRICKS_TOKEN
+    body = request_json()
+    jobs = [j for j in body.get("jobs") or [] if isinstance(j, dict) and j.get("databricksJobId")]
+    if not jobs:
+        return json_response({"error": "jobs with a databricksJobId are required"}), 400
+
+    dbx = None
+    if dbx_host and dbx_token:
+        try:
+            dbx = DatabricksClient(host=dbx_host, token=dbx_token)
+        except DatabricksClientError as e:
+            return json_response({"error": str(e)}), 500
+
+    def fetch_one(job: dict) -> tuple[str, dict]:
+        dbx_job_id = job["databricksJobId"]
+        flow_name = (job.get("flowName") or "").strip()
+        job_run_id = job.get("jobRunId")
+
+        if flow_name and job_run_id:
+            cached = db.load_dbx(flow_name, str(job_run_id))
+            if cached:
+                cached["cached"] = True
+                return str(dbx_job_id), cached
+
+        if dbx is None:
+            return str(dbx_job_id), {"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}
+
+        try:
+            response_data = fetch_dbx_details(dbx, dbx_job_id, dbx_host)
+        except DatabricksClientError as e:
+            return str(dbx_job_id), {"error": str(e)}
+
+        if flow_name and job_run_id:
+            enqueue_write(db.save_dbx, flow_name, str(job_run_id), response_data)
+        return str(dbx_job_id), response_data
+
+    results = dict(_DBX_POOL.map(fetch_one, jobs))
+
+    return json_response({"results": results})
 
 
 @app.route("/api/databricks/refresh", methods=["POST"])
 def refresh_databricks_details():
     """Clear cached DBX data and event log analysis, then re-fetch from Databricks."""
-    body = request.get_json(silent=True) or {}
+    dbx_host, dbx_token = Config.DATABRICKS_HOST, Config.DATABRICKS_TOKEN
+    body = request_json()
     dbx_job_id = body.get("databricksJobId")
     flow_name = body.get("flowName", "").strip()
     job_run_id = body.get("jobRunId")
 
     if not dbx_job_id:
-        return jsonify({"error": "databricksJobId is required"}), 400
+        return json_response({"error": "databricksJobId is required"}), 400
 
     # Clear cached data
     if flow_name and job_run_id:
         db.clear_dbx_job(flow_name, str(job_run_id))
         flow_store.clear_dbx_job(flow_name, str(job_run_id))  # also clear file-based eventlogs
 
-    if not Config.DATABRICKS_HOST or not Config.DATABRICKS_TOKEN:
-        return jsonify({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
+    if not dbx_host or not dbx_token:
+        return json_response({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
 
     try:
-        dbx = DatabricksClient(host=Config.DATABRICKS_HOST, token=Config.DATABRICKS_TOKEN)
-        run_details = dbx.get_run_details(dbx_job_id)
-
-        cluster_events = []
-        cluster_id = run_details.get("clusterId")
-        if cluster_id:
-            try:
-                cluster_events = dbx.get_cluster_events(cluster_id)
-            except DatabricksClientError as e:
-                run_details["clusterEventsError"] = str(e)
-
-        response_data = {
-            "databricksJobId": dbx_job_id,
-            "databricksHost": Config.DATABRICKS_HOST,
-            "runDetails": run_details,
-            "clusterEvents": cluster_events,
-            "cached": False,
-        }
+        dbx = DatabricksClient(host=dbx_host, token=dbx_token)
+        response_data = fetch_dbx_details(dbx, dbx_job_id, dbx_host)
 
         # Save fresh data to cache
         if flow_name and job_run_id:
-            db.save_dbx(flow_name, str(job_run_id), response_data)
+            enqueue_write(db.save_dbx, flow_name, str(job_run_id), response_data)
 
-        return jsonify(response_data)
+        return json_response(response_data)
     except DatabricksClientError as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
 
 
 @app.route("/api/eventlog", methods=["POST"])
 def fetch_eventlog():
     """Download a Spark event log from DBFS and run the analyzer."""
-    body = request.get_json(silent=True) or {}
+    dbx_host, dbx_token = Config.DATABRICKS_HOST, Config.DATABRICKS_TOKEN
+    body = request_json()
     cluster_id = body.get("clusterId")
     job_run_id = body.get("jobRunId")
     flow_name = body.get("flowName", "").strip()
 
     if not cluster_id:
-        return jsonify({"error": "clusterId is required"}), 400
+        return json_response({"error": "clusterId is required"}), 400
     if not job_run_id:
-        return jsonify({"error": "jobRunId is required"}), 400
-    if not Config.DATABRICKS_HOST or not Config.DATABRICKS_TOKEN:
-        return jsonify({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
+        return json_response({"error": "jobRunId is required"}), 400
+    if not dbx_host or not dbx_token:
+        return json_response({"error": "DATABRICKS_HOST and DATABRICKS_TOKEN must be configured"}), 400
 
     # Always store in jobs/<jobRunId>/ directory
     job_dir = LEGACY_JOBS_DIR / str(job_run_id)
@@ -445,45 +701,62 @@ def fetch_eventlog():
     analysis_file = job_dir / "analysis.json"
 
     # Return cached analysis if it exists
-    if analysis_file.exists():
-        with open(analysis_file, "r") as f:
-            return jsonify({"status": "complete", "cached": True, "analysis": json.load(f)})
-
-    # Step 1: Download event log from DBFS
+    if has_analysis(analysis_file):
+        return analysis_response(analysis_file, status="complete", cached=True)
+
+    key = str(job_run_id)
+    with _EVENTLOG_IN_FLIGHT_LOCK:
+        if key in _EVENTLOG_IN_FLIGHT:
+            return json_response({
+                "status": "running",
+                "error": "Event log analysis is already running for this job run; try again shortly",
+            }), 202
+        _EVENTLOG_IN_FLIGHT.add(key)
+
+    def release(_future=None):
+        with _EVENTLOG_IN_FLIGHT_LOCK:
+            _EVENTLOG_IN_FLIGHT.discard(key)
+
+    handed_off = False
     try:
-        eventlog_path = download_eventlog(
-            host=Config.DATABRICKS_HOST,
-            token=Config.DATABRICKS_TOKEN,
-            cluster_id=cluster_id,
-            local_dir=str(job_dir),
-        )
-    except EventLogError as e:
-        return jsonify({"error": f"Event log download failed: {e}"}), 500
+        # A run that finished between the check above and claiming the slot
+        if has_analysis(analysis_file):
+            return analysis_response(analysis_file, status="complete", cached=True)
 
-    # Step 2: Run the analyzer script
-    try:
-        result = subprocess.run(
-            [sys.executable, str(ANALYZER_SCRIPT), eventlog_path],
-            capture_output=True,
-            text=True,
-            timeout=120,
-        )
-        if result.returncode != 0:
-            return jsonify({
-                "error": f"Analyzer failed: {result.stderr.strip()}",
-                "stdout": result.stdout.strip(),
-            }), 500
-    except subprocess.TimeoutExpired:
-        return jsonify({"error": "Analyzer timed out (120s limit)"}), 500
+        # Step 1: Download event log from DBFS
+        try:
+            eventlog_path = download_eventlog(
+                host=dbx_host,
+                token=dbx_token,
+                cluster_id=cluster_id,
+                local_dir=str(job_dir),
+            )
+        except EventLogError as e:
+            return json_response({"error": f"Event log download failed: {e}"}), 500
+
+        # Step 2: Run the analyzer in-process (writes analysis.json next to the event log).
+        # The slot is released when the analysis itself ends, not when this request gives up.
+        future = _ANALYZER_POOL.submit(analyze_eventlog.analyze, eventlog_path)
+        future.add_done_callback(release)
+        handed_off = True
+    finally:
+        if not handed_off:
+            release()
 
-    # Step 3: Read and return the analysis
-    if not analysis_file.exists():
-        return jsonify({"error": "Analyzer completed but analysis.json was not produced"}), 500
+    try:
+        analysis = future.result(timeout=ANALYZER_TIMEOUT_S)
+    except FuturesTimeoutError:
+        return json_response({
+            "status": "running",
+            "error": f"Analyzer still running after {ANALYZER_TIMEOUT_S}s; try again shortly",
+        }), 202
+    except Exception as e:
+        return json_response({"error": f"Analyzer failed: {e}"}), 500
 
-    with open(analysis_file, "r") as f:
-        analysis = json.load(f)
+    if analysis is None:
+        return json_response({"error": "Analyzer completed but analysis.json was not produced"}), 500
 
-    return jsonify({"status": "complete", "cached": False, "analysis": analysis})
+    return json_response({"status": "complete", "cached": False, "analysis": analysis})
 
 
 @app.route("/api/eventlog/<job_run_id>", methods=["GET"])
@@ -493,41 +766,37 @@ def get_eventlog_analysis(job_run_id):
     analysis_file = LEGACY_JOBS_DIR / str(job_run_id) / "analysis.json"
 
     # Fallback: check flow-based storage for backwards compatibility
-    if not analysis_file.exists():
+    if not has_analysis(analysis_file):
         flow_name = request.args.get("flowName", "").strip()
         if flow_name:
             alt = Path(flow_store.eventlog_dir(flow_name, str(job_run_id))) / "analysis.json"
-            if alt.exists():
+            if has_analysis(alt):
                 analysis_file = alt
         # Also scan all flow directories
-        if not analysis_file.exists():
+        if not has_analysis(analysis_file):
             flows_dir = Path(__file__).resolve().parent / "flows"
             if flows_dir.exists():
                 for fd in flows_dir.iterdir():
                     candidate = fd / "eventlogs" / str(job_run_id) / "analysis.json"
-                    if candidate.exists():
+                    if has_analysis(candidate):
                         analysis_file = candidate
                         break
 
-    if not analysis_file.exists():
-        return jsonify({"error": "No analysis found for this job run", "exists": False}), 404
+    if not has_analysis(analysis_file):
+        return json_response({"error": "No analysis found for this job run", "exists": False}), 404
 
-    with open(analysis_file, "r") as f:
-        return jsonify({"status": "complete", "exists": True, "analysis": json.load(f)})
+    return analysis_response(analysis_file, status="complete", exists=True)
 
 @app.route("/api/flows", methods=["GET"])
 def get_flows():
     """Return list of saved flows with their cached data."""
-    flows_list = db.list_flows()
-    result = []
-    for f in flows_list:
-        flow_data = db.load_flow(f["name"])
-        if flow_data:
-            # Add analyzed jobs info (file-based)
-            flow_data["analyzedJobs"] = flow_store.list_analyzed_jobs(f["name"])
-            flow_data["dbxCachedJobs"] = db.list_dbx_cached_jobs(f["name"])
-            result.append(flow_data)
-    return jsonify({"flows": result})
+    result = db.load_all_flows()
+    dbx_cached = db.list_all_dbx_cached_jobs()
+    for flow_data in result:
+        # Add analyzed jobs info (file-based)
+        flow_data["analyzedJobs"] = flow_store.list_analyzed_jobs(flow_data["name"])
+        flow_data["dbxCachedJobs"] = dbx_cached.get(flow_data["name"], [])
+    return json_response({"flows": result})
 
 
 @app.route("/api/flows/<path:flow_name>", methods=["DELETE"])
@@ -535,7 +804,7 @@ def remove_flow(flow_name):
     """Remove a flow and all its data."""
     db.delete_flow(flow_name)
     deleted = flow_store.delete_flow(flow_name)  # clean up file-based data too
-    return jsonify({"success": True})
+    return json_response({"success": True})
 
 
 @app.route("/api/config", methods=["GET"])
@@ -551,13 +820,13 @@ def get_config():
             cfg[key] = {"value": mask_value(str(raw)), "masked": True}
         else:
             cfg[key] = {"value": str(raw), "masked": False}
-    return jsonify(cfg)
+    return json_response(cfg)
 
 
 @app.route("/api/config", methods=["PUT"])
 def update_config():
     """Update .env file and reload config in-memory."""
-    body = request.get_json(silent=True) or {}
+    body = request_json()
     updates = {}
     for key in CONFIGURABLE_KEYS:
         if key in body:
@@ -569,7 +838,7 @@ def update_config():
     if updates:
         write_env_file(updates)
         reload_config()
-    return jsonify({"success": True, "updated": list(updates.keys())})
+    return json_response({"success": True, "updated": list(updates.keys())})
 
 
 # ---------------------------------------------------------------------------
@@ -579,74 +848,59 @@ def update_config():
 @app.route("/api/all-jobs/fetch", methods=["POST"])
 def fetch_all_jobs():
     """Fetch latest jobs from AACP and store in SQLite."""
-    body = request.get_json(silent=True) or {}
+    body = request_json()
     count = body.get("count", 100)  # initial fetch count
     refresh = body.get("refresh", False)  # True = incremental from latest known
 
     if not Config.PLATFORM_API_TOKEN or not Config.PLATFORM_API_BASE_URL:
-        return jsonify({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
+        return json_response({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
 
     try:
-        api = PlatformAPI(
-            token=Config.PLATFORM_API_TOKEN,
-            base_url=Config.PLATFORM_API_BASE_URL,
-        )
+        api = platform_client(Config.PLATFORM_API_TOKEN, Config.PLATFORM_API_BASE_URL)
 
         stop_at_id = None
         if refresh:
             stop_at_id = db.get_latest_job_id("aacp")
 
-        all_jobs = []
-        offset = 0
         page_size = 25
-
-        while len(all_jobs) < count:
-            raw_jobs, has_more = api.get_all_jobs(
-                limit=page_size, offset=offset, stop_at_id=stop_at_id
-            )
-            summaries = [extract_job_summary(j) for j in raw_jobs]
-            all_jobs.extend(summaries)
-            offset += page_size
-
-            if not has_more:
-                break
+        raw_jobs, _ = api.get_all_jobs_pages(
+            math.ceil(count / page_size), limit=page_size, stop_at_id=stop_at_id
+        )
+        all_jobs = [extract_job_summary(j) for j in raw_jobs]
 
         # Store in SQLite
         db.upsert_jobs(all_jobs, source="aacp")
 
-        return jsonify({
+        return json_response({
             "fetched": len(all_jobs),
             "message": f"Fetched {len(all_jobs)} jobs",
         })
     except PlatformAPIError as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
 
 
 @app.route("/api/all-jobs/load-more", methods=["POST"])
 def load_more_jobs():
     """Fetch next page of jobs from AACP API and store."""
-    body = request.get_json(silent=True) or {}
+    body = request_json()
     offset = body.get("offset", 0)
 
     if not Config.PLATFORM_API_TOKEN or not Config.PLATFORM_API_BASE_URL:
-        return jsonify({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
+        return json_response({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
 
     try:
-        api = PlatformAPI(
-            token=Config.PLATFORM_API_TOKEN,
-            base_url=Config.PLATFORM_API_BASE_URL,
-        )
+        api = platform_client(Config.PLATFORM_API_TOKEN, Config.PLATFORM_API_BASE_URL)
         raw_jobs, has_more = api.get_all_jobs(limit=25, offset=offset)
         summaries = [extract_job_summary(j) for j in raw_jobs]
         db.upsert_jobs(summaries, source="aacp")
 
-        return jsonify({
+        return json_response({
             "fetched": len(summaries),
             "hasMore": has_more,
             "nextOffset": offset + 25,
         })
     except PlatformAPIError as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
 
 
 @app.route("/api/all-jobs/refresh", methods=["POST"])
@@ -658,41 +912,29 @@ def refresh_all_jobs():
     DBX cache is untouched — only job columns are updated.
     """
     if not Config.PLATFORM_API_TOKEN or not Config.PLATFORM_API_BASE_URL:
-        return jsonify({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
+        return json_response({"error": "PLATFORM_API_BASE_URL and PLATFORM_API_TOKEN must be configured"}), 400
 
     try:
         stats = db.get_kpi_stats("aacp")
         total_in_db = stats.get("total_jobs", 0)
         if total_in_db == 0:
-            return jsonify({"refreshed": 0, "message": "No jobs to refresh"})
+            return json_response({"refreshed": 0, "message": "No jobs to refresh"})
 
-        api = PlatformAPI(
-            token=Config.PLATFORM_API_TOKEN,
-            base_url=Config.PLATFORM_API_BASE_URL,
-        )
+        api = platform_client(Config.PLATFORM_API_TOKEN, Config.PLATFORM_API_BASE_URL)
 
-        all_jobs = []
-        offset = 0
         page_size = 25
-
-        while offset < total_in_db:
-            raw_jobs, has_more = api.get_all_jobs(limit=page_size, offset=offset)
-            summaries = [extract_job_summary(j) for j in raw_jobs]
-            all_jobs.extend(summaries)
-            offset += page_size
-
-            if not has_more:
-                break
+        raw_jobs, _ = api.get_all_jobs_pages(math.ceil(total_in_db / page_size), limit=page_size)
+        all_jobs = [extract_job_summary(j) for j in raw_jobs]
 
         db.upsert_jobs(all_jobs, source="aacp")
 
-        return jsonify({
+        return json_response({
             "refreshed": len(all_jobs),
             "totalInDb": total_in_db,
             "message": f"Refreshed {len(all_jobs)} jobs",
         })
     except PlatformAPIError as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
 
 
 @app.route("/api/all-jobs", methods=["GET"])
@@ -701,6 +943,14 @@ def query_all_jobs():
     offset = request.args.get("offset", 0, type=int)
     limit = request.args.get("limit", 50, type=int)
     group = request.args.get("group", "", type=str)
+    # Keyset cursor "<created_at>,<job_id>" from a previous page's nextBefore
+    before = None
+    before_arg = request.args.get("before", "", type=str).strip()
+    if before_arg:
+        created_at, _, job_id = before_arg.rpartition(",")
+        if not created_at or not job_id.isdigit():
+            return json_response({"error": "before must be '<created_at>,<job_id>'"}), 400
+        before = (created_at, int(job_id))
 
     filters = {}
     for key in ("status", "flow_id", "flow_name", "creator_email", "ran_for", "search", "days"):
@@ -710,15 +960,17 @@ def query_all_jobs():
 
     if group == "flow":
         groups = db.get_jobs_grouped_by_flow(filters=filters)
-        return jsonify({"grouped": True, "groups": groups})
+        return json_response({"grouped": True, "groups": groups})
 
-    jobs, total = db.get_jobs(filters=filters, offset=offset, limit=limit)
-    return jsonify({
+    jobs, total = db.get_jobs(filters=filters, offset=offset, limit=limit, before=before)
+    last = jobs[-1] if jobs else None
+    return json_response({
         "jobs": jobs,
         "total": total,
         "offset": offset,
         "limit": limit,
-        "hasMore": offset + limit < total,
+        "hasMore": len(jobs) == limit if before else offset + limit < total,
+        "nextBefore": f"{last['created_at']},{last['job_id']}" if last and last["created_at"] else None,
     })
 
 
@@ -727,7 +979,7 @@ def all_jobs_kpis():
     """Return KPI stats for the All Jobs tab."""
     days = request.args.get("days", 30, type=int)
     stats = db.get_kpi_stats("aacp", days=days)
-    return jsonify(stats)
+    return json_response(stats)
 
 
 @app.route("/api/all-jobs/daily-chart", methods=["GET"])
@@ -736,7 +988,7 @@ def all_jobs_daily_chart():
     days = request.args.get("days", 30, type=int)
     status_filter = request.args.get("status", "", type=str).strip()
     data = db.get_daily_job_counts(source="aacp", days=days, status_filter=status_filter)
-    return jsonify({"days": data})
+    return json_response({"days": data})
 
 
 # ---------------------------------------------------------------------------
@@ -748,5 +1000,6 @@ db.init_db()
 db.migrate_from_files()
 
 if __name__ == "__main__":
+    # Local use only — run wsgi.py under gunicorn for concurrent requests
     print("🚀 Tri-Tracker starting on http://localhost:5050")
-    app.run(host="0.0.0.0", port=5050, debug=True)
+    app.run(host="0.0.0.0", port=5050, debug=False)
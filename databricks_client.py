@@ -8,9 +8,13 @@ Condensed wrapper around the Databricks Python SDK to fetch:
 
 from __future__ import annotations
 
+import enum
+import functools
+import itertools
 import logging
 from datetime import datetime, timezone
 from dataclasses import is_dataclass
+from operator import attrgetter, itemgetter
 from typing import Any, Optional
 
 from databricks.sdk import WorkspaceClient
@@ -23,34 +27,93 @@ class DatabricksClientError(Exception):
     pass
 
 
+_SCALAR_TYPES = (str, int, float, bool)
+_EXACT_SCALARS = frozenset(_SCALAR_TYPES)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_dataclass_type(cls: type) -> bool:
+    return is_dataclass(cls)
+
+
 def _serialize(obj: Any, depth: int = 0, max_depth: int = 6) -> Any:
-    """Recursively convert SDK dataclass objects into plain dicts."""
-    if depth > max_depth or obj is None:
-        return None
-    if isinstance(obj, (str, int, float, bool)):
-        return obj
-    # Enums
-    if hasattr(obj, "value") and hasattr(obj, "name") and hasattr(type(obj), "__members__"):
+    """Convert SDK dataclass objects into plain dicts.
+
+    Walks with an explicit stack of (parent, key, value, depth) slots rather
+    than recursing; containers are created up front and filled in as their
+    children are popped, so key order is preserved.
+    """
+    root: list = [None]
+    stack = [(root, 0, obj, depth)]
+    while stack:
+        parent, key, value, d = stack.pop()
+        if d > max_depth or value is None:
+            parent[key] = None
+            continue
+        cls = type(value)
+        if cls in _EXACT_SCALARS or isinstance(value, _SCALAR_TYPES):
+            parent[key] = value
+            continue
+        if isinstance(value, enum.Enum):
+            parent[key] = value.value
+            continue
+        # Dataclasses / objects with __dict__ (None fields dropped)
+        if _is_dataclass_type(cls) or (not isinstance(value, (dict, list, tuple)) and hasattr(value, "__dict__")):
+            items = [(k, v) for k, v in value.__dict__.items() if v is not None]
+            out: Any = {}
+        elif isinstance(value, dict):
+            items = list(value.items())
+            out = {}
+        elif isinstance(value, (list, tuple)):
+            items = list(enumerate(value))
+            out = [None] * len(items)
+        else:
+            parent[key] = str(value)
+            continue
+        parent[key] = out
+        if not items:
+            continue
+        if isinstance(out, dict):
+            out.update(dict.fromkeys(k for k, _ in items))
+        child_depth = d + 1
+        stack.extend((out, k, v, child_depth) for k, v in items)
+    return root[0]
+
+
+def _enum_val(obj: Any) -> Any:
+    """Return an enum's value; anything else goes through _serialize."""
+    if isinstance(obj, enum.Enum):
         return obj.value
-    # Dataclasses / objects with __dict__
-    if is_dataclass(obj) and not isinstance(obj, type):
-        return {k: _serialize(v, depth + 1, max_depth) for k, v in obj.__dict__.items() if v is not None}
-    if isinstance(obj, dict):
-        return {k: _serialize(v, depth + 1, max_depth) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_serialize(i, depth + 1, max_depth) for i in obj]
-    if hasattr(obj, "__dict__"):
-        return {k: _serialize(v, depth + 1, max_depth) for k, v in obj.__dict__.items() if v is not None}
-    return str(obj)
+    return _serialize(obj)
 
 
+@functools.lru_cache(maxsize=1024)
 def _ms_to_iso(ms: Optional[int]) -> Optional[str]:
-    """Convert millisecond epoch to ISO-8601 string."""
+    """Convert millisecond epoch to ISO-8601 string (memoized; events often repeat timestamps)."""
     if ms is None:
         return None
     return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).isoformat()
 
 
+_TIMING_FIELDS = ("start_time", "end_time", "setup_duration", "execution_duration", "cleanup_duration")
+_timing_get = attrgetter(*_TIMING_FIELDS)
+_AUTOSCALE_FIELDS = ("min_workers", "max_workers")
+_autoscale_get = attrgetter(*_AUTOSCALE_FIELDS)
+
+
+def _get_fields(obj: Any, getter: attrgetter, names: tuple[str, ...]) -> tuple:
+    """Fetch several attributes in one attrgetter call; missing ones read as None."""
+    try:
+        return getter(obj)
+    except AttributeError:
+        return tuple(getattr(obj, n, None) for n in names)
+
+
+def _autoscale_dict(asc: Any) -> dict:
+    min_workers, max_workers = _get_fields(asc, _autoscale_get, _AUTOSCALE_FIELDS)
+    return {"minWorkers": min_workers, "maxWorkers": max_workers}
+
+
 class DatabricksClient:
     """Lightweight wrapper for the Databricks SDK calls we need."""
 
@@ -121,14 +184,11 @@ class DatabricksClient:
             if nc:
                 raw_conf = getattr(nc, "spark_conf", None)
                 if raw_conf and isinstance(raw_conf, dict):
-                    spark_conf = dict(raw_conf)
+                    spark_conf = raw_conf.copy()
                 node_type_id = getattr(nc, "node_type_id", None)
                 asc = getattr(nc, "autoscale", None)
                 if asc:
-                    autoscale = {
-                        "minWorkers": getattr(asc, "min_workers", None),
-                        "maxWorkers": getattr(asc, "max_workers", None),
-                    }
+                    autoscale = _autoscale_dict(asc)
 
         # Also check cluster_spec (single-task jobs)
         if not spark_conf:
@@ -138,24 +198,22 @@ class DatabricksClient:
                 if nc:
                     raw_conf = getattr(nc, "spark_conf", None)
                     if raw_conf and isinstance(raw_conf, dict):
-                        spark_conf = dict(raw_conf)
+                        spark_conf = raw_conf.copy()
                     if not node_type_id:
                         node_type_id = getattr(nc, "node_type_id", None)
                     if not autoscale:
                         asc = getattr(nc, "autoscale", None)
                         if asc:
-                            autoscale = {
-                                "minWorkers": getattr(asc, "min_workers", None),
-                                "maxWorkers": getattr(asc, "max_workers", None),
-                            }
+                            autoscale = _autoscale_dict(asc)
 
         # Timing
+        start, end, setup, execution, cleanup = _get_fields(run, _timing_get, _TIMING_FIELDS)
         timing = {
-            "startTime": _ms_to_iso(getattr(run, "start_time", None)),
-            "endTime": _ms_to_iso(getattr(run, "end_time", None)),
-            "setupDurationMs": getattr(run, "setup_duration", None),
-            "executionDurationMs": getattr(run, "execution_duration", None),
-            "cleanupDurationMs": getattr(run, "cleanup_duration", None),
+            "startTime": _ms_to_iso(start),
+            "endTime": _ms_to_iso(end),
+            "setupDurationMs": setup,
+            "executionDurationMs": execution,
+            "cleanupDurationMs": cleanup,
         }
 
         return {
@@ -180,30 +238,26 @@ class DatabricksClient:
             return []
 
         try:
-            raw_events = []
-            for i, event in enumerate(self.client.clusters.events(cluster_id=cluster_id)):
-                if i >= limit:
-                    break
-                raw_events.append(event)
+            raw_events = list(itertools.islice(self.client.clusters.events(cluster_id=cluster_id), limit))
         except Exception as e:
             raise DatabricksClientError(f"clusters.events({cluster_id}) failed: {e}") from e
 
         events = []
         for ev in raw_events:
-            ts = getattr(ev, "timestamp", None)
+            ts = getattr(ev, "timestamp", None) or 0
             event_type = getattr(ev, "type", None)
             if event_type:
-                event_type = _serialize(event_type)
+                event_type = _enum_val(event_type)
 
             details_obj = getattr(ev, "details", None)
             details: dict = {}
             if details_obj:
                 cause = getattr(details_obj, "cause", None)
                 if cause:
-                    details["cause"] = _serialize(cause)
+                    details["cause"] = _enum_val(cause)
                 reason = getattr(details_obj, "reason", None)
                 if reason:
-                    details["reasonCode"] = _serialize(getattr(reason, "code", None))
+                    details["reasonCode"] = _enum_val(getattr(reason, "code", None))
                 cur = getattr(details_obj, "current_num_workers", None)
                 tgt = getattr(details_obj, "target_num_workers", None)
                 if cur is not None:
@@ -213,11 +267,13 @@ class DatabricksClient:
 
             events.append({
                 "timestamp": ts,
-                "isoTime": _ms_to_iso(ts),
+                "isoTime": _ms_to_iso(ts) if ts else None,
                 "eventType": event_type,
                 "details": details,
             })
 
-        # Return chronological (oldest first)
-        events.sort(key=lambda e: e.get("timestamp") or 0)
+        # The API returns newest first; reversing leaves an ascending run, so
+        # the sort is a single linear pass unless the order was off
+        events.reverse()
+        events.sort(key=itemgetter("timestamp"))
         return events
@@ -7,15 +7,22 @@ Event logs and analysis.json files remain on disk.
 DB file: tri-tracker.db in the app root.
 """
 
-import json
+import atexit
 import logging
 import os
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime, timezone
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
+
 log = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).resolve().parent / "tri-tracker.db"
@@ -24,18 +31,45 @@ DB_PATH = Path(__file__).resolve().parent / "tri-tracker.db"
 # Connection management
 # ---------------------------------------------------------------------------
 
+_tls = threading.local()
+
+
 def _get_conn() -> sqlite3.Connection:
-    """Get a connection with WAL mode and foreign keys enabled."""
-    conn = sqlite3.connect(str(DB_PATH), timeout=10)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
+    """Get this thread's connection, opening it (WAL, foreign keys) on first use.
+
+    Connections are reused for the life of the thread so the PRAGMAs run once
+    and SQLite's page cache stays warm between calls.
+    """
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+        # NORMAL is durable under WAL (only the last commit can be lost on power failure)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        _tls.conn = conn
     return conn
 
 
+def close_conn():
+    """Close this thread's cached connection, if any."""
+    conn = getattr(_tls, "conn", None)
+    if conn is not None:
+        _tls.conn = None
+        conn.close()
+
+
+atexit.register(close_conn)
+
+
 @contextmanager
 def get_db():
-    """Context manager for database operations."""
+    """Context manager for database operations (commits on success, rolls back on error)."""
     conn = _get_conn()
     try:
         yield conn
@@ -43,8 +77,24 @@ def get_db():
     except Exception:
         conn.rollback()
         raise
-    finally:
-        conn.close()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode a JSON column value (stored as a BLOB; old TEXT rows still load)."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params: Any = ()) -> list[dict]:
+    """Run a query and return plain dicts, keyed from cursor.description once.
+
+    Bypasses sqlite3.Row so rows come back as tuples and each dict is built
+    with a single zip instead of per-column Row lookups.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
 
 
 # ---------------------------------------------------------------------------
@@ -73,22 +123,24 @@ CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_flow_id ON jobs(flow_id);
 CREATE INDEX IF NOT EXISTS idx_jobs_flow_name ON jobs(flow_name);
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+-- job_id is the rowid, so this also covers (source, created_at DESC, job_id)
+CREATE INDEX IF NOT EXISTS idx_jobs_source_created ON jobs(source, created_at DESC);
 
 CREATE TABLE IF NOT EXISTS flows (
     name            TEXT PRIMARY KEY,
-    pairs           TEXT,
+    pairs           BLOB,
     aac_base_url    TEXT,
     onprem_base_url TEXT,
     onprem_enabled  INTEGER DEFAULT 1,
     match_window    INTEGER DEFAULT 10,
-    errors          TEXT,
+    errors          BLOB,
     last_fetched    TEXT
 );
 
 CREATE TABLE IF NOT EXISTS dbx_cache (
     flow_name       TEXT,
     job_run_id      TEXT,
-    data            TEXT,
+    data            BLOB,
     cached_at       TEXT,
     PRIMARY KEY (flow_name, job_run_id)
 );
@@ -106,110 +158,169 @@ def init_db():
 # Jobs CRUD
 # ---------------------------------------------------------------------------
 
+# Columns the All Jobs table renders (skips bookkeeping like fetched_at)
+JOB_LIST_COLUMNS = (
+    "job_id, status, flow_id, flow_name, ran_for, ran_from, creator_email, "
+    "created_at, execution_time_min, databricks_job_id"
+)
+
 def upsert_jobs(jobs: list[dict], source: str = "aacp"):
     """Insert or update jobs from API response."""
     if not jobs:
         return 0
     now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for j in jobs:
+        job_id = j.get("jobRunId") or j.get("id")
+        if not job_id:
+            continue
+        rows.append((
+            int(job_id),
+            j.get("status"),
+            j.get("flowId"),
+            j.get("flowName"),
+            j.get("ranFor"),
+            j.get("ranFrom"),
+            j.get("creatorEmail"),
+            j.get("createdAt"),
+            j.get("updatedAt"),
+            j.get("executionTimeMinutes"),
+            j.get("executionLanguage"),
+            j.get("databricksJobId"),
+            source,
+            now,
+        ))
+    # One prepared statement for the whole batch, committed once
     with get_db() as conn:
-        count = 0
-        for j in jobs:
-            job_id = j.get("jobRunId") or j.get("id")
-            if not job_id:
-                continue
-            conn.execute("""
-                INSERT INTO jobs (job_id, status, flow_id, flow_name, ran_for, ran_from,
-                                  creator_email, created_at, updated_at, execution_time_min,
-                                  execution_language, databricks_job_id, source, fetched_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(job_id) DO UPDATE SET
-                    status = excluded.status,
-                    ran_for = excluded.ran_for,
-                    ran_from = excluded.ran_from,
-                    creator_email = excluded.creator_email,
-                    updated_at = excluded.updated_at,
-                    execution_time_min = excluded.execution_time_min,
-                    fetched_at = excluded.fetched_at
-            """, (
-                int(job_id),
-                j.get("status"),
-                j.get("flowId"),
-                j.get("flowName"),
-                j.get("ranFor"),
-                j.get("ranFrom"),
-                j.get("creatorEmail"),
-                j.get("createdAt"),
-                j.get("updatedAt"),
-                j.get("executionTimeMinutes"),
-                j.get("executionLanguage"),
-                j.get("databricksJobId"),
-                source,
-                now,
-            ))
-            count += 1
+        conn.executemany("""
+            INSERT INTO jobs (job_id, status, flow_id, flow_name, ran_for, ran_from,
+                              creator_email, created_at, updated_at, execution_time_min,
+                              execution_language, databricks_job_id, source, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(job_id) DO UPDATE SET
+                status = excluded.status,
+                ran_for = excluded.ran_for,
+                ran_from = excluded.ran_from,
+                creator_email = excluded.creator_email,
+                updated_at = excluded.updated_at,
+                execution_time_min = excluded.execution_time_min,
+                fetched_at = excluded.fetched_at
+        """, rows)
+    count = len(rows)
     log.info(f"Upserted {count} jobs (source={source})")
     return count
 
 
+# Filter key -> WHERE clause; params come from _filter_params
+_FILTER_SQL = {
+    "status": "LOWER(status) = LOWER(?)",
+    "flow_id": "flow_id = ?",
+    "flow_name": "flow_name LIKE ?",
+    "creator_email": "creator_email LIKE ?",
+    "ran_for": "LOWER(ran_for) = LOWER(?)",
+    "days": "created_at >= datetime('now', ?)",
+    "search": "(CAST(job_id AS TEXT) LIKE ? OR flow_name LIKE ? OR creator_email LIKE ? OR status LIKE ?)",
+}
+_JOBS_FILTER_KEYS = tuple(_FILTER_SQL)
+_GROUPED_FILTER_KEYS = ("status", "flow_name", "creator_email", "days")
+
+
+def _filter_params(key: str, value: Any) -> list:
+    if key in ("flow_name", "creator_email"):
+        return [f"%{value}%"]
+    if key == "days":
+        return [f"-{value} days"]
+    if key == "search":
+        return [f"%{value}%"] * 4
+    return [value]
+
+
+def _active_filters(
+    filters: Optional[dict], source: str, allowed: tuple[str, ...]
+) -> tuple[tuple[str, ...], list]:
+    """Return (active filter keys in canonical order, positional params)."""
+    keys = tuple(k for k in allowed if filters and filters.get(k))
+    params: list[Any] = [source]
+    for k in keys:
+        params.extend(_filter_params(k, filters[k]))
+    return keys, params
+
+
+def _where_sql(filter_keys: tuple[str, ...]) -> str:
+    return " AND ".join(["source = ?"] + [_FILTER_SQL[k] for k in filter_keys])
+
+
+@lru_cache(maxsize=64)
+def _build_jobs_query(filter_keys: tuple[str, ...]) -> tuple[str, str, str]:
+    """Return (count_sql, page_sql, keyset_page_sql) for a set of active filters.
+
+    Memoized so each filter combination yields the identical SQL string and
+    hits sqlite3's per-connection statement cache.
+    """
+    where = _where_sql(filter_keys)
+    return (
+        f"SELECT COUNT(*) as cnt FROM jobs WHERE {where}",
+        f"SELECT {JOB_LIST_COLUMNS}, COUNT(*) OVER () AS total_count FROM jobs WHERE {where} "
+        "ORDER BY created_at DESC, job_id DESC LIMIT ? OFFSET ?",
+        # job_id breaks created_at ties so rows sharing the boundary timestamp
+        # land on exactly one page; NULL created_at sorts last, so the seek
+        # runs on into that tail (whose rows carry no cursor of their own)
+        f"SELECT {JOB_LIST_COLUMNS} FROM jobs WHERE {where} "
+        "AND ((created_at, job_id) < (?, ?) OR created_at IS NULL) "
+        "ORDER BY created_at DESC, job_id DESC LIMIT ?",
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_grouped_query(filter_keys: tuple[str, ...]) -> str:
+    # avg_exec stays a SQL aggregate: SQLite's AVG/ROUND round halves away from
+    # zero, where Python's round() on the float mean would not
+    return (
+        "SELECT *, ROUND(AVG(execution_time_min) OVER (PARTITION BY flow_id), 1) AS avg_exec "
+        f"FROM jobs WHERE {_where_sql(filter_keys)} AND flow_id IS NOT NULL "
+        "ORDER BY flow_id, created_at DESC"
+    )
+
+
 def get_jobs(
     filters: Optional[dict] = None,
     offset: int = 0,
     limit: int = 25,
     source: str = "aacp",
+    before: Optional[tuple[str, int]] = None,
 ) -> tuple[list[dict], int]:
     """
     Query jobs with optional filters.
 
     filters keys: status, flow_id, flow_name, creator_email, ran_for, search (text across fields)
+    before: keyset cursor (created_at, job_id) of the last row already shown —
+    return the page after it in (created_at, job_id) DESC order (offset is
+    ignored when set).
     Returns: (list_of_jobs, total_count)
     """
-    where_clauses = ["source = ?"]
-    params: list[Any] = [source]
-
-    if filters:
-        if filters.get("status"):
-            where_clauses.append("LOWER(status) = LOWER(?)")
-            params.append(filters["status"])
-        if filters.get("flow_id"):
-            where_clauses.append("flow_id = ?")
-            params.append(filters["flow_id"])
-        if filters.get("flow_name"):
-            where_clauses.append("flow_name LIKE ?")
-            params.append(f"%{filters['flow_name']}%")
-        if filters.get("creator_email"):
-            where_clauses.append("creator_email LIKE ?")
-            params.append(f"%{filters['creator_email']}%")
-        if filters.get("ran_for"):
-            where_clauses.append("LOWER(ran_for) = LOWER(?)")
-            params.append(filters["ran_for"])
-        if filters.get("days"):
-            where_clauses.append("created_at >= datetime('now', ?)")
-            params.append(f"-{filters['days']} days")
-        if filters.get("search"):
-            search = f"%{filters['search']}%"
-            where_clauses.append(
-                "(CAST(job_id AS TEXT) LIKE ? OR flow_name LIKE ? OR creator_email LIKE ? OR status LIKE ?)"
-            )
-            params.extend([search, search, search, search])
-
-    where = " AND ".join(where_clauses)
+    filter_keys, params = _active_filters(filters, source, _JOBS_FILTER_KEYS)
+    count_sql, page_sql, keyset_sql = _build_jobs_query(filter_keys)
 
     with get_db() as conn:
-        # Total count
-        row = conn.execute(f"SELECT COUNT(*) as cnt FROM jobs WHERE {where}", params).fetchone()
-        total = row["cnt"]
+        if before:
+            rows = _fetch_dicts(conn, keyset_sql, params + [*before, limit])
+            total = None
+        else:
+            # Page and total in one pass via COUNT(*) OVER ()
+            rows = _fetch_dicts(conn, page_sql, params + [limit, offset])
+            total = rows[0]["total_count"] if rows else None
+            for r in rows:
+                del r["total_count"]
 
-        # Page of results
-        rows = conn.execute(
-            f"SELECT * FROM jobs WHERE {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
-            params + [limit, offset],
-        ).fetchall()
+        # Keyset pages and past-the-end offsets still need the separate count
+        if total is None:
+            total = conn.execute(count_sql, params).fetchone()["cnt"]
 
-    return [dict(r) for r in rows], total
+    return rows, total
 
 
 def get_latest_job_id(source: str = "aacp") -> Optional[int]:
-    """Return the most recent job_id we have stored."""
+    """Return the most recent job_id we have stored (index-only seek on idx_jobs_source_created)."""
     with get_db() as conn:
         row = conn.execute(
             "SELECT job_id FROM jobs WHERE source = ? ORDER BY created_at DESC LIMIT 1",
@@ -227,101 +338,71 @@ def get_jobs_grouped_by_flow(
     Each group has: flow_id, flow_name, job_count, min_exec, max_exec, avg_exec,
     earliest_created_at, latest_created_at, status_counts, ran_from_counts, creators, jobs[]
     """
-    where_clauses = ["source = ?"]
-    params: list[Any] = [source]
-
-    if filters:
-        if filters.get("status"):
-            where_clauses.append("LOWER(status) = LOWER(?)")
-            params.append(filters["status"])
-        if filters.get("flow_name"):
-            where_clauses.append("flow_name LIKE ?")
-            params.append(f"%{filters['flow_name']}%")
-        if filters.get("creator_email"):
-            where_clauses.append("creator_email LIKE ?")
-            params.append(f"%{filters['creator_email']}%")
-        if filters.get("days"):
-            where_clauses.append("created_at >= datetime('now', ?)")
-            params.append(f"-{filters['days']} days")
-
-    where = " AND ".join(where_clauses)
+    filter_keys, params = _active_filters(filters, source, _GROUPED_FILTER_KEYS)
 
+    # One scan ordered by flow, grouped in Python (instead of 1 + G queries)
     with get_db() as conn:
-        groups = conn.execute(f"""
-            SELECT flow_id, flow_name,
-                   COUNT(*) as job_count,
-                   MIN(execution_time_min) as min_exec,
-                   MAX(execution_time_min) as max_exec,
-                   ROUND(AVG(execution_time_min), 1) as avg_exec,
-                   MIN(created_at) as earliest_created_at,
-                   MAX(created_at) as latest_created_at
-            FROM jobs
-            WHERE {where} AND flow_id IS NOT NULL
-            GROUP BY flow_id
-            ORDER BY MAX(created_at) DESC
-        """, params).fetchall()
-
-        result = []
-        for g in groups:
-            jobs = conn.execute(
-                f"SELECT * FROM jobs WHERE {where} AND flow_id = ? ORDER BY created_at DESC",
-                params + [g["flow_id"]],
-            ).fetchall()
-
-            jobs_list = [dict(j) for j in jobs]
-
-            # Compute status counts
-            status_counts = {}
-            for j in jobs_list:
-                s = j.get("status", "Unknown")
-                status_counts[s] = status_counts.get(s, 0) + 1
-
-            # Compute ran_from counts
-            ran_from_counts = {}
-            for j in jobs_list:
-                rf = j.get("ran_from") or "Unknown"
-                ran_from_counts[rf] = ran_from_counts.get(rf, 0) + 1
-
-            # Compute ran_for counts
-            ran_for_counts = {}
-            for j in jobs_list:
-                rfr = j.get("ran_for") or "Unknown"
-                ran_for_counts[rfr] = ran_for_counts.get(rfr, 0) + 1
-
-            # Distinct creators
-            creators = list({j.get("creator_email", "") for j in jobs_list if j.get("creator_email")})
-
-            result.append({
-                "flow_id": g["flow_id"],
-                "flow_name": g["flow_name"],
-                "job_count": g["job_count"],
-                "min_exec": g["min_exec"],
-                "max_exec": g["max_exec"],
-                "avg_exec": g["avg_exec"],
-                "earliest_created_at": g["earliest_created_at"],
-                "latest_created_at": g["latest_created_at"],
-                "status_counts": status_counts,
-                "ran_from_counts": ran_from_counts,
-                "ran_for_counts": ran_for_counts,
-                "creators": creators,
-                "jobs": jobs_list,
-            })
-
+        rows = _fetch_dicts(conn, _build_grouped_query(filter_keys), params)
+
+    result = []
+    for flow_id, group in groupby(rows, key=itemgetter("flow_id")):
+        jobs_list = list(group)
+        avg_exec = jobs_list[0]["avg_exec"]
+        for j in jobs_list:
+            del j["avg_exec"]
+
+        exec_times = [j["execution_time_min"] for j in jobs_list if j["execution_time_min"] is not None]
+        created = [j["created_at"] for j in jobs_list if j["created_at"] is not None]
+
+        # Compute status / ran_from / ran_for counts in one pass
+        status_counts = {}
+        ran_from_counts = {}
+        ran_for_counts = {}
+        creators = set()
+        for j in jobs_list:
+            s = j.get("status", "Unknown")
+            status_counts[s] = status_counts.get(s, 0) + 1
+            rf = j.get("ran_from") or "Unknown"
+            ran_from_counts[rf] = ran_from_counts.get(rf, 0) + 1
+            rfr = j.get("ran_for") or "Unknown"
+            ran_for_counts[rfr] = ran_for_counts.get(rfr, 0) + 1
+            if j.get("creator_email"):
+                creators.add(j["creator_email"])
+
+        result.append({
+            "flow_id": flow_id,
+            "flow_name": jobs_list[0]["flow_name"],
+            "job_count": len(jobs_list),
+            "min_exec": min(exec_times) if exec_times else None,
+            "max_exec": max(exec_times) if exec_times else None,
+            "avg_exec": avg_exec,
+            "earliest_created_at": min(created) if created else None,
+            "latest_created_at": max(created) if created else None,
+            "status_counts": status_counts,
+            "ran_from_counts": ran_from_counts,
+            "ran_for_counts": ran_for_counts,
+            "creators": list(creators),
+            "jobs": jobs_list,
+        })
+
+    # Most recently active flow first (flows without timestamps last)
+    result.sort(key=lambda g: (g["latest_created_at"] is not None, g["latest_created_at"] or ""), reverse=True)
     return result
 
 
 def get_kpi_stats(source: str = "aacp", days: int = 30) -> dict:
     """Compute KPI stats: total jobs, success rate, jobs per day in the given window."""
     with get_db() as conn:
-        total = conn.execute(
-            "SELECT COUNT(*) as cnt FROM jobs WHERE source = ? AND created_at >= datetime('now', ?)",
-            (source, f"-{days} days")
-        ).fetchone()["cnt"]
-
-        completed = conn.execute(
-            "SELECT COUNT(*) as cnt FROM jobs WHERE source = ? AND LOWER(status) IN ('complete', 'completed') AND created_at >= datetime('now', ?)",
+        row = conn.execute(
+            """
+            SELECT COUNT(*) as total,
+                   COALESCE(SUM(CASE WHEN LOWER(status) IN ('complete', 'completed') THEN 1 ELSE 0 END), 0) as completed
+            FROM jobs
+            WHERE source = ? AND created_at >= datetime('now', ?)
+            """,
             (source, f"-{days} days"),
-        ).fetchone()["cnt"]
+        ).fetchone()
+    total, completed = row["total"], row["completed"]
 
     return {
         "total_jobs": total,
@@ -370,32 +451,43 @@ def get_daily_job_counts(
 # Flow CRUD (replaces flow_store.py for structured data)
 # ---------------------------------------------------------------------------
 
+_SAVE_FLOW_SQL = """
+    INSERT INTO flows (name, pairs, aac_base_url, onprem_base_url, onprem_enabled,
+                       match_window, errors, last_fetched)
+    VALUES (:name, :pairs, :aac_base_url, :onprem_base_url, :onprem_enabled,
+            :match_window, :errors, :last_fetched)
+    ON CONFLICT(name) DO UPDATE SET
+        pairs = excluded.pairs,
+        aac_base_url = excluded.aac_base_url,
+        onprem_base_url = excluded.onprem_base_url,
+        onprem_enabled = excluded.onprem_enabled,
+        match_window = excluded.match_window,
+        errors = excluded.errors,
+        last_fetched = excluded.last_fetched
+"""
+
+
+def _flow_metadata_params(metadata: dict, now: str) -> dict:
+    """Named parameters for the flows metadata columns (everything but name and pairs)."""
+    return {
+        "aac_base_url": metadata.get("aacBaseUrl", ""),
+        "onprem_base_url": metadata.get("onpremBaseUrl", ""),
+        "onprem_enabled": 1 if metadata.get("onpremEnabled", True) else 0,
+        "match_window": metadata.get("matchWindowMinutes", 10),
+        "errors": _dumps(metadata.get("errors", [])),
+        "last_fetched": now,
+    }
+
+
+def _flow_params(name: str, pairs: list, metadata: dict, now: str) -> dict:
+    return {"name": name, "pairs": _dumps(pairs), **_flow_metadata_params(metadata, now)}
+
+
 def save_flow(name: str, pairs: list, metadata: dict):
     """Save or update a flow."""
     now = datetime.now(timezone.utc).isoformat()
     with get_db() as conn:
-        conn.execute("""
-            INSERT INTO flows (name, pairs, aac_base_url, onprem_base_url, onprem_enabled,
-                               match_window, errors, last_fetched)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                pairs = excluded.pairs,
-                aac_base_url = excluded.aac_base_url,
-                onprem_base_url = excluded.onprem_base_url,
-                onprem_enabled = excluded.onprem_enabled,
-                match_window = excluded.match_window,
-                errors = excluded.errors,
-                last_fetched = excluded.last_fetched
-        """, (
-            name,
-            json.dumps(pairs, default=str),
-            metadata.get("aacBaseUrl", ""),
-            metadata.get("onpremBaseUrl", ""),
-            1 if metadata.get("onpremEnabled", True) else 0,
-            metadata.get("matchWindowMinutes", 10),
-            json.dumps(metadata.get("errors", []), default=str),
-            now,
-        ))
+        conn.execute(_SAVE_FLOW_SQL, _flow_params(name, pairs, metadata, now))
     log.info(f"Saved flow '{name}' with {len(pairs)} pairs")
 
 
@@ -405,14 +497,25 @@ def load_flow(name: str) -> Optional[dict]:
         row = conn.execute("SELECT * FROM flows WHERE name = ?", (name,)).fetchone()
     if not row:
         return None
+    return _flow_from_row(row)
+
+
+def load_all_flows() -> list[dict]:
+    """Load every flow in one query, ordered by name."""
+    with get_db() as conn:
+        rows = conn.execute("SELECT * FROM flows ORDER BY name").fetchall()
+    return [_flow_from_row(r) for r in rows]
+
+
+def _flow_from_row(row: sqlite3.Row) -> dict:
     return {
         "name": row["name"],
-        "pairs": json.loads(row["pairs"]) if row["pairs"] else [],
+        "pairs": orjson.loads(row["pairs"]) if row["pairs"] else [],
         "aacBaseUrl": row["aac_base_url"] or "",
         "onpremBaseUrl": row["onprem_base_url"] or "",
         "onpremEnabled": bool(row["onprem_enabled"]),
         "matchWindowMinutes": row["match_window"],
-        "errors": json.loads(row["errors"]) if row["errors"] else [],
+        "errors": orjson.loads(row["errors"]) if row["errors"] else [],
         "lastFetched": row["last_fetched"],
     }
 
@@ -424,7 +527,7 @@ def list_flows() -> list[dict]:
     return [{
         "name": r["name"],
         "lastFetched": r["last_fetched"],
-        "jobCount": len(json.loads(r["pairs"])) if r["pairs"] else 0,
+        "jobCount": len(orjson.loads(r["pairs"])) if r["pairs"] else 0,
     } for r in rows]
 
 
@@ -447,29 +550,50 @@ def merge_jobs_flow(name: str, new_pairs: list, metadata: dict) -> list:
         return new_pairs
 
     existing_pairs = existing["pairs"]
-    index = {}
-    for pair in existing_pairs:
-        key = _pair_key(pair)
-        if key:
-            index[key] = pair
+    key_of = _pair_key
+    index = {k: p for p in existing_pairs if (k := key_of(p))}
+    dirty = False
 
     for pair in new_pairs:
-        key = _pair_key(pair)
-        if key and key in index:
-            old = index[key]
-            if pair.get("aac"):
-                old["aac"] = pair["aac"]
-            if pair.get("onprem"):
-                old["onprem"] = pair["onprem"]
-            old["matched"] = pair.get("matched", old.get("matched", False))
-        elif key:
+        key = key_of(pair)
+        if not key:
+            continue
+        old = index.get(key)
+        if old is not None:
+            for side in ("aac", "onprem"):
+                if pair.get(side) and old.get(side) != pair[side]:
+                    old[side] = pair[side]
+                    dirty = True
+            matched = pair.get("matched", old.get("matched", False))
+            if old.get("matched") != matched:
+                old["matched"] = matched
+                dirty = True
+        else:
             existing_pairs.append(pair)
             index[key] = pair
+            dirty = True
 
-    save_flow(name, existing_pairs, metadata)
+    if dirty:
+        save_flow(name, existing_pairs, metadata)
+    else:
+        # Pairs unchanged — refresh metadata without re-encoding the pairs blob
+        _save_flow_metadata(name, metadata)
     return existing_pairs
 
 
+def _save_flow_metadata(name: str, metadata: dict):
+    """Update a flow's metadata columns, leaving pairs untouched."""
+    now = datetime.now(timezone.utc).isoformat()
+    with get_db() as conn:
+        conn.execute("""
+            UPDATE flows SET aac_base_url = :aac_base_url, onprem_base_url = :onprem_base_url,
+                             onprem_enabled = :onprem_enabled, match_window = :match_window,
+                             errors = :errors, last_fetched = :last_fetched
+            WHERE name = :name
+        """, {"name": name, **_flow_metadata_params(metadata, now)})
+    log.info(f"Flow '{name}' pairs unchanged; updated metadata only")
+
+
 def _pair_key(pair: dict) -> Optional[str]:
     aac = pair.get("aac")
     if aac and aac.get("jobRunId"):
@@ -492,20 +616,23 @@ def load_dbx(flow_name: str, job_run_id: str) -> Optional[dict]:
             (flow_name, job_run_id),
         ).fetchone()
     if row:
-        return json.loads(row["data"])
+        return orjson.loads(row["data"])
     return None
 
 
+_SAVE_DBX_SQL = """
+    INSERT INTO dbx_cache (flow_name, job_run_id, data, cached_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(flow_name, job_run_id) DO UPDATE SET
+        data = excluded.data, cached_at = excluded.cached_at
+"""
+
+
 def save_dbx(flow_name: str, job_run_id: str, data: dict):
     """Persist DBX details."""
     now = datetime.now(timezone.utc).isoformat()
     with get_db() as conn:
-        conn.execute("""
-            INSERT INTO dbx_cache (flow_name, job_run_id, data, cached_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(flow_name, job_run_id) DO UPDATE SET
-                data = excluded.data, cached_at = excluded.cached_at
-        """, (flow_name, job_run_id, json.dumps(data, default=str), now))
+        conn.execute(_SAVE_DBX_SQL, (flow_name, job_run_id, _dumps(data), now))
     log.info(f"Cached DBX for flow='{flow_name}' job={job_run_id}")
 
 
@@ -519,6 +646,16 @@ def list_dbx_cached_jobs(flow_name: str) -> list[str]:
     return [r["job_run_id"] for r in rows]
 
 
+def list_all_dbx_cached_jobs() -> dict[str, list[str]]:
+    """Return {flow_name: [job_run_id, ...]} for every flow with cached DBX data."""
+    with get_db() as conn:
+        rows = conn.execute("SELECT flow_name, job_run_id FROM dbx_cache").fetchall()
+    result: dict[str, list[str]] = {}
+    for r in rows:
+        result.setdefault(r["flow_name"], []).append(r["job_run_id"])
+    return result
+
+
 def clear_dbx_job(flow_name: str, job_run_id: str) -> bool:
     """Remove cached DBX details for a specific job run."""
     with get_db() as conn:
@@ -536,59 +673,74 @@ def clear_dbx_job(flow_name: str, job_run_id: str) -> bool:
 # Migration from file-based flow_store
 # ---------------------------------------------------------------------------
 
+def _read_migration_file(path: Path) -> Optional[tuple[bytes, Any]]:
+    """Read and parse one JSON file for migration; None if missing or invalid."""
+    try:
+        raw = path.read_bytes()
+        return raw, orjson.loads(raw)
+    except FileNotFoundError:
+        return None
+    except (orjson.JSONDecodeError, OSError) as e:
+        log.warning(f"Skipping migration of {path}: {e}")
+        return None
+
+
 def migrate_from_files():
     """
     Migrate existing file-based data into SQLite.
     Reads flows/<name>/flow_data.json and flows/<name>/dbx/<id>.json
+
+    File reads and JSON parsing run on a thread pool; rows are written in one
+    transaction with one executemany per table. DBX files are only read for
+    flows not yet in the database, so startups after the first stay cheap.
     """
     flows_dir = Path(__file__).resolve().parent / "flows"
     if not flows_dir.exists():
         return
 
-    migrated = 0
-    for entry in flows_dir.iterdir():
-        if not entry.is_dir():
-            continue
-
-        flow_data_file = entry / "flow_data.json"
-        if not flow_data_file.exists():
-            continue
-
-        try:
-            with open(flow_data_file) as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            log.warning(f"Skipping migration of {flow_data_file}: {e}")
-            continue
-
-        name = data.get("name", entry.name)
+    now = datetime.now(timezone.utc).isoformat()
+    entries = [entry for entry in flows_dir.iterdir() if entry.is_dir()]
+    if not entries:
+        return
 
-        # Check if flow already exists in DB
-        existing = load_flow(name)
-        if existing:
-            continue
+    with ThreadPoolExecutor(thread_name_prefix="db-migrate") as pool, get_db() as conn:
+        flow_files = pool.map(_read_migration_file, [e / "flow_data.json" for e in entries])
 
-        pairs = data.get("pairs", [])
-        metadata = {
-            "aacBaseUrl": data.get("aacBaseUrl", ""),
-            "onpremBaseUrl": data.get("onpremBaseUrl", ""),
-            "onpremEnabled": data.get("onpremEnabled", True),
-            "matchWindowMinutes": data.get("matchWindowMinutes", 10),
-            "errors": data.get("errors", []),
-        }
-        save_flow(name, pairs, metadata)
-        migrated += 1
-
-        # Migrate DBX cache
-        dbx_dir = entry / "dbx"
-        if dbx_dir.exists():
-            for dbx_file in dbx_dir.glob("*.json"):
-                try:
-                    with open(dbx_file) as f:
-                        dbx_data = json.load(f)
-                    save_dbx(name, dbx_file.stem, dbx_data)
-                except (json.JSONDecodeError, IOError) as e:
-                    log.warning(f"Skipping DBX migration {dbx_file}: {e}")
-
-    if migrated > 0:
-        log.info(f"Migrated {migrated} flows from files to SQLite")
+        pending = {}  # name -> (flow data, flow dir), first directory wins
+        for entry, loaded in zip(entries, flow_files):
+            if loaded is None:
+                continue
+            data = loaded[1]
+            name = data.get("name", entry.name)
+            # Check if flow already exists in DB
+            if name in pending or conn.execute("SELECT 1 FROM flows WHERE name = ?", (name,)).fetchone():
+                continue
+            pending[name] = (data, entry)
+        if not pending:
+            return
+
+        dbx_files = [
+            (name, dbx_file)
+            for name, (_, entry) in pending.items()
+            for dbx_file in (entry / "dbx").glob("*.json")
+        ]
+        dbx_loaded = pool.map(_read_migration_file, [f for _, f in dbx_files])
+
+        flow_rows = []
+        for name, (data, _) in pending.items():
+            metadata = {
+                "aacBaseUrl": data.get("aacBaseUrl", ""),
+                "onpremBaseUrl": data.get("onpremBaseUrl", ""),
+                "onpremEnabled": data.get("onpremEnabled", True),
+                "matchWindowMinutes": data.get("matchWindowMinutes", 10),
+                "errors": data.get("errors", []),
+            }
+            flow_rows.append(_flow_params(name, data.get("pairs", []), metadata, now))
+        conn.executemany(_SAVE_FLOW_SQL, flow_rows)
+        conn.executemany(_SAVE_DBX_SQL, [
+            (name, dbx_file.stem, loaded[0], now)
+            for (name, dbx_file), loaded in zip(dbx_files, dbx_loaded)
+            if loaded is not None
+        ])
+
+    log.info(f"Migrated {len(flow_rows)} flows from files to SQLite")
@@ -8,33 +8,71 @@ Larger jobs split the log across multiple files:
     eventlog              – current / most recent events (plain text)
     eventlog-YYYY-MM-DD--HH-MM.gz  – older events (gzip compressed)
 
-This module discovers ALL files in that directory, downloads them,
-decompresses .gz archives, and concatenates everything (oldest → newest)
-into a single unified eventlog file for analysis.
+This module discovers ALL files in that directory, streams them down
+(inflating .gz archives on the fly), and concatenates everything
+(oldest → newest) into a single unified eventlog file for analysis.
 """
 
-import gzip
+import functools
 import logging
+import os
 import re
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, Tuple
 
 from databricks.sdk import WorkspaceClient
 
+try:
+    # ISA-L inflate is 2-3x faster than zlib on large archives
+    from isal import igzip as gzip
+except ImportError:  # pragma: no cover - isal has no wheel for this platform
+    import gzip
+
+try:
+    # Multi-core inflate for single large archives
+    import rapidgzip
+except ImportError:  # pragma: no cover
+    rapidgzip = None
+
 log = logging.getLogger(__name__)
 
+# Parallel part downloads; stays under the SDK's default HTTP pool size (20)
+DOWNLOAD_WORKERS = 8
+# Parts are staged in memory up to this size, then spill to a temp file. Kept
+# small so the whole staging window (MAX_STAGED_PARTS parts) holds at most
+# 64 MiB of RAM per fetch; larger parts sit on disk and are appended with
+# copy_file_range
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+# Cap on parts downloaded ahead of the writer (bounds staging memory/disk)
+MAX_STAGED_PARTS = 2 * DOWNLOAD_WORKERS
+# Archives this large go through rapidgzip; below it the prescan overhead dominates
+PARALLEL_INFLATE_MIN_BYTES = 64 * 1024 * 1024
+
 
 class EventLogError(Exception):
     """Raised when event log discovery or download fails."""
     pass
 
 
+@functools.lru_cache(maxsize=8)
 def _make_client(host: str, token: str) -> WorkspaceClient:
-    """Create a Databricks WorkspaceClient."""
+    """
+    Create a Databricks WorkspaceClient, reused per (host, token) so its
+    HTTP connection pool and TLS sessions survive across calls.
+    """
     return WorkspaceClient(host=host, token=token)
 
 
+def _basename(path: str) -> str:
+    """Final component of a DBFS path (cheaper than building a Path per entry)."""
+    return path[path.rfind("/") + 1:]
+
+
 def find_eventlog_dir(client: WorkspaceClient, cluster_id: str) -> str:
     """
     Recursively search for the directory containing eventlog files under
@@ -49,6 +87,14 @@ def find_eventlog_dir(client: WorkspaceClient, cluster_id: str) -> str:
     Returns the full DBFS path to the directory that contains eventlog files.
     Raises EventLogError if not found.
     """
+    return _find_eventlog_listing(client, cluster_id)[0]
+
+
+def _find_eventlog_listing(client: WorkspaceClient, cluster_id: str) -> Tuple[str, list]:
+    """
+    Like find_eventlog_dir, but also return that directory's listing so
+    callers don't spend another DBFS round trip re-listing it.
+    """
     base_path = f"/trifacta/logs/{cluster_id}/eventlog"
     log.info(f"Searching for event log directory under: {base_path}")
 
@@ -65,40 +111,52 @@ def find_eventlog_dir(client: WorkspaceClient, cluster_id: str) -> str:
             f"Cluster '{cluster_id}' may not have event logs."
         )
 
-    # Recursively search for a directory containing an 'eventlog' file
-    def _search(path: str, depth: int = 0) -> Optional[str]:
-        if depth > 5:  # Safety limit
-            return None
-        try:
-            children = list(client.dbfs.list(path))
-            for item in children:
-                item_name = Path(item.path).name
-                if not item.is_dir and item_name.startswith("eventlog"):
-                    # Found an eventlog file — return its parent directory
-                    return path
-            # No eventlog file here; recurse into subdirectories
-            for item in children:
-                if item.is_dir:
-                    result = _search(item.path, depth + 1)
-                    if result:
-                        return result
-        except Exception as e:
-            log.warning(f"Error listing '{path}': {e}")
-        return None
-
-    eventlog_dir = _search(base_path)
-    if not eventlog_dir:
+    found = _search_eventlog_dir(client, base_path, items)
+    if not found:
         raise EventLogError(
             f"Could not find eventlog files under '{base_path}'. "
             f"Directory exists but no eventlog files were found."
         )
 
-    log.info(f"Found event log directory: {eventlog_dir}")
-    return eventlog_dir
+    log.info(f"Found event log directory: {found[0]}")
+    return found
+
+
+def _search_eventlog_dir(
+    client: WorkspaceClient, base_path: str, base_items: list, max_depth: int = 5,
+) -> Optional[Tuple[str, list]]:
+    """
+    Breadth-first search for the shallowest directory holding an 'eventlog'
+    file, returning (path, listing). Each level's sibling directories are
+    listed concurrently; a directory that can't be listed is skipped.
+    """
+    def _list(path: str) -> list:
+        try:
+            return list(client.dbfs.list(path))
+        except Exception as e:
+            log.warning(f"Error listing '{path}': {e}")
+            return []
+
+    level = [(base_path, base_items)]
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="dbfs-ls") as pool:
+        for depth in range(max_depth + 1):
+            subdirs = []
+            for path, children in level:
+                for item in children:
+                    if item.is_dir:
+                        subdirs.append(item.path)
+                    elif _basename(item.path).startswith("eventlog"):
+                        # Found an eventlog file — return its parent directory
+                        return path, children
+            if not subdirs or depth == max_depth:
+                break
+            level = list(zip(subdirs, pool.map(_list, subdirs)))
+    return None
 
 
 # Regex to extract timestamp from filenames like eventlog-2026-02-23--13-30.gz
-_TS_RE = re.compile(r"eventlog-(\d{4}-\d{2}-\d{2}--\d{2}-\d{2})")
+# (used with .match — rolled archives always start with "eventlog-")
+_TS_RE = re.compile(r"eventlog-(\d{4}-\d{2}-\d{2}--\d{2}-\d{2})", re.ASCII)
 
 
 def _sort_key(filename: str) -> Tuple[int, str]:
@@ -106,30 +164,118 @@ def _sort_key(filename: str) -> Tuple[int, str]:
     Sort key so that timestamped .gz files come first (oldest → newest),
     and the plain 'eventlog' file comes last.
     """
-    m = _TS_RE.search(filename)
+    if "-" not in filename:
+        return (1, filename)    # plain 'eventlog' — no timestamp to parse
+    m = _TS_RE.match(filename)
     if m:
         return (0, m.group(1))  # timestamped archives first, sorted by time
     return (1, filename)        # plain 'eventlog' last
 
 
-def _download_file(client: WorkspaceClient, dbfs_path: str, local_path: Path) -> None:
-    """Download a single file from DBFS to a local path."""
-    local_path.parent.mkdir(parents=True, exist_ok=True)
-    with client.dbfs.download(dbfs_path) as remote_file:
-        with open(local_path, "wb") as f:
-            chunk_size = 1024 * 1024  # 1 MB chunks
-            while True:
-                chunk = remote_file.read(chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
+def _copy_stream(src, dst) -> None:
+    """
+    Copy src to dst through one reused buffer: readinto() avoids allocating
+    a fresh bytes object per chunk. Streams without readinto fall back to read().
+    """
+    readinto = getattr(src, "readinto", None)
+    if readinto is None:
+        shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+        return
+    buf = bytearray(COPY_CHUNK_BYTES)
+    view = memoryview(buf)
+    while True:
+        n = readinto(buf)
+        if not n:
+            break
+        dst.write(view[:n])
+
+
+def _inflate_parallel(client: WorkspaceClient, dbfs_path: str, out_f) -> None:
+    """
+    Inflate a large .gz archive across all cores with rapidgzip.
+
+    rapidgzip needs random access, so the compressed bytes are landed in a
+    temp file first; the remote stream itself is not seekable.
+    """
+    with tempfile.TemporaryFile() as raw:
+        with client.dbfs.download(dbfs_path) as remote_file:
+            _copy_stream(remote_file, raw)
+        raw.seek(0)
+        with rapidgzip.open(raw, parallelization=os.cpu_count() or 1) as src:
+            _copy_stream(src, out_f)
+
+
+def _stream_part_into(client: WorkspaceClient, item, out_f) -> None:
+    """Stream one eventlog part from DBFS into out_f, inflating .gz archives on the fly."""
+    filename = _basename(item.path)
+    log.info(f"Downloading {item.path} ({item.file_size or 0} bytes)")
+    gzipped = filename.endswith(".gz")
+    try:
+        if gzipped and rapidgzip and (item.file_size or 0) >= PARALLEL_INFLATE_MIN_BYTES:
+            _inflate_parallel(client, item.path, out_f)
+        else:
+            with client.dbfs.download(item.path) as remote_file:
+                src = gzip.GzipFile(fileobj=remote_file, mode="rb") if gzipped else remote_file
+                _copy_stream(src, out_f)
+    except Exception as e:
+        raise EventLogError(f"Failed to download '{item.path}': {e}") from e
+
 
+def _stream_part(client: WorkspaceClient, item) -> tempfile.SpooledTemporaryFile:
+    """
+    Stream one eventlog part into a spooled staging buffer (memory, spilling
+    to disk when large) so it can download while older parts are written.
 
-def _decompress_gz(gz_path: Path, out_path: Path) -> None:
-    """Decompress a .gz file to out_path."""
-    with gzip.open(gz_path, "rb") as f_in:
-        with open(out_path, "wb") as f_out:
-            shutil.copyfileobj(f_in, f_out)
+    Returns the staging file rewound to the start.
+    """
+    staged = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        _stream_part_into(client, item, staged)
+    except Exception:
+        staged.close()
+        raise
+    staged.seek(0)
+    return staged
+
+
+def _splice(in_fd: int, out_fd: int, nbytes: int) -> None:
+    """Copy nbytes between file descriptors inside the kernel (no userspace buffer)."""
+    copy = os.copy_file_range
+    try:
+        n = copy(in_fd, out_fd, nbytes)
+    except OSError:  # EXDEV/ENOSYS/EINVAL: cross-device or unsupported fs
+        def copy(src, dst, count):
+            return os.sendfile(dst, src, None, count)
+        n = copy(in_fd, out_fd, nbytes)
+    nbytes -= n
+    while nbytes > 0 and n:
+        n = copy(in_fd, out_fd, nbytes)
+        nbytes -= n
+
+
+def _append_part(staged: tempfile.SpooledTemporaryFile, out_f, nbytes: int) -> None:
+    """Append a staged part to out_f, kernel-to-kernel once it has spilled to disk."""
+    # Parts larger than the spool limit have already rolled over to a real
+    # temp file, so fileno() is cheap; smaller ones are still in memory
+    if nbytes > SPOOL_MAX_BYTES and hasattr(os, "copy_file_range"):
+        in_fd = staged.fileno()
+        # Read once front to back, then discarded: let the kernel read ahead
+        # aggressively (the whole part is in page cache if it was just written)
+        os.posix_fadvise(in_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        out_f.flush()
+        _splice(in_fd, out_f.fileno(), nbytes)
+    else:
+        _copy_stream(staged, out_f)
+
+
+def _preallocate(out_f, nbytes: int) -> None:
+    """Reserve disk blocks for out_f so the appends don't extend it piecemeal."""
+    if nbytes <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(out_f.fileno(), 0, nbytes)
+    except OSError as e:  # e.g. EOPNOTSUPP on some network filesystems
+        log.debug(f"posix_fallocate skipped: {e}")
 
 
 def download_all_eventlogs(
@@ -143,11 +289,10 @@ def download_all_eventlogs(
 
     Steps:
         1. Find the DBFS directory containing eventlog files.
-        2. List all files in that directory.
-        3. Download each file to a local temp area.
-        4. Decompress any .gz files.
-        5. Concatenate all files oldest → newest into <local_dir>/eventlog.
-        6. Clean up temp files.
+        2. List all files in that directory and order them oldest → newest.
+        3. Stream each file (in parallel), inflating .gz archives as they arrive;
+           the oldest goes straight to the output, the rest via staging buffers.
+        4. Append the parts in order into <local_dir>/eventlog.
 
     Returns:
         Path to the final unified eventlog file.
@@ -155,76 +300,77 @@ def download_all_eventlogs(
     Raises:
         EventLogError on failure.
     """
-    # Step 1: Find directory
-    eventlog_dir = find_eventlog_dir(client, cluster_id)
-
-    # Step 2: List all files
-    try:
-        items = list(client.dbfs.list(eventlog_dir))
-    except Exception as e:
-        raise EventLogError(f"Cannot list eventlog directory '{eventlog_dir}': {e}") from e
+    # Steps 1 & 2: Find directory (its listing comes back with it),
+    # then sort files oldest → newest by name
+    eventlog_dir, items = _find_eventlog_listing(client, cluster_id)
 
     files = [item for item in items if not item.is_dir]
     if not files:
         raise EventLogError(f"No files found in eventlog directory '{eventlog_dir}'.")
+    files.sort(key=lambda item: _sort_key(_basename(item.path)))
 
     log.info(f"Found {len(files)} eventlog file(s) in {eventlog_dir}")
 
-    # Step 3 & 4: Download and decompress
     local_dir_path = Path(local_dir)
     local_dir_path.mkdir(parents=True, exist_ok=True)
-    tmp_dir = local_dir_path / "_eventlog_parts"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-
-    decompressed_files: List[Tuple[str, Path]] = []  # (sort_key_name, local_path)
-
-    for item in files:
-        filename = Path(item.path).name
-        local_file = tmp_dir / filename
-        log.info(f"Downloading {item.path} ({item.file_size or 0} bytes)")
-
-        try:
-            _download_file(client, item.path, local_file)
-        except Exception as e:
-            raise EventLogError(f"Failed to download '{item.path}': {e}") from e
-
-        # Decompress .gz files
-        if filename.endswith(".gz"):
-            decompressed_name = filename[:-3]  # strip .gz
-            decompressed_path = tmp_dir / decompressed_name
-            log.info(f"Decompressing {filename} → {decompressed_name}")
-            try:
-                _decompress_gz(local_file, decompressed_path)
-            except Exception as e:
-                raise EventLogError(f"Failed to decompress '{filename}': {e}") from e
-            # Remove the .gz file, keep decompressed
-            local_file.unlink()
-            decompressed_files.append((filename, decompressed_path))
-        else:
-            decompressed_files.append((filename, local_file))
-
-    # Step 5: Sort oldest → newest and concatenate
-    decompressed_files.sort(key=lambda x: _sort_key(x[0]))
-
     final_eventlog = local_dir_path / "eventlog"
-    log.info(f"Concatenating {len(decompressed_files)} file(s) into {final_eventlog}")
+    log.info(f"Concatenating {len(files)} file(s) into {final_eventlog}")
 
+    # Steps 3 & 4: downloads are network-bound, so later parts stream into
+    # staging buffers in parallel while the oldest part streams straight into
+    # the output; each staged part is appended once all older ones are written.
+    # At most MAX_STAGED_PARTS are in flight, so parts that finish ahead of
+    # the writer can't pile up without bound.
     total_bytes = 0
-    with open(final_eventlog, "wb") as out_f:
-        for filename, part_path in decompressed_files:
-            part_size = part_path.stat().st_size
-            total_bytes += part_size
-            log.info(f"  Appending {filename} ({part_size:,} bytes)")
-            with open(part_path, "rb") as in_f:
-                shutil.copyfileobj(in_f, out_f)
-            # Ensure newline between files so JSON lines don't merge
-            out_f.write(b"\n")
+    head, rest = files[0], iter(files[1:])
+    workers = max(1, min(DOWNLOAD_WORKERS, len(files) - 1))
+    pending: deque = deque()  # (item, future) in write order
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dbfs-dl") as pool:
+        def _refill() -> None:
+            while len(pending) < MAX_STAGED_PARTS:
+                item = next(rest, None)
+                if item is None:
+                    return
+                pending.append((item, pool.submit(_stream_part, client, item)))
+
+        _refill()
+        try:
+            with open(final_eventlog, "w+b") as out_f:
+                # Inflated size is at least the listed (compressed) size, so
+                # reserve that up front and trim to the real length at the end
+                _preallocate(out_f, sum(item.file_size or 0 for item in files))
+                _stream_part_into(client, head, out_f)
+                total_bytes = out_f.tell()
+                log.info(f"  Appended {_basename(head.path)} ({total_bytes:,} bytes)")
+                out_f.flush()
+                # Ensure a newline between files so JSON lines don't merge
+                # (Spark parts normally end in one already)
+                if total_bytes and os.pread(out_f.fileno(), 1, total_bytes - 1) != b"\n":
+                    out_f.write(b"\n")
+
+                while pending:
+                    item, future = pending.popleft()
+                    _refill()
+                    with future.result() as staged:
+                        part_size = staged.seek(0, 2)
+                        if not part_size:
+                            continue
+                        staged.seek(-1, 2)
+                        needs_newline = staged.read(1) != b"\n"
+                        staged.seek(0)
+                        total_bytes += part_size
+                        log.info(f"  Appending {_basename(item.path)} ({part_size:,} bytes)")
+                        _append_part(staged, out_f, part_size)
+                    if needs_newline:
+                        out_f.write(b"\n")
+                out_f.truncate()
+        except BaseException:
+            for _, future in pending:
+                future.cancel()
+            raise
 
     log.info(f"Unified eventlog: {total_bytes:,} bytes → {final_eventlog}")
-
-    # Step 6: Clean up temp directory
-    shutil.rmtree(tmp_dir, ignore_errors=True)
-
     return str(final_eventlog)
 
 
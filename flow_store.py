@@ -10,25 +10,32 @@ Directory layout:
             analysis.json       # Compressed analysis output
 """
 
-import json
+import functools
 import logging
 import os
 import re
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+import orjson
 
 log = logging.getLogger(__name__)
 
 FLOWS_DIR = Path(__file__).resolve().parent / "flows"
 
 
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s\-.]')
+_WHITESPACE_RE = re.compile(r'[\s]+')
+
+
+@functools.lru_cache(maxsize=512)
 def _sanitize_name(name: str) -> str:
     """Sanitize flow name for safe use as a directory name."""
     # Replace problematic chars with underscores, collapse multiples
-    safe = re.sub(r'[^\w\s\-.]', '_', name)
-    safe = re.sub(r'[\s]+', ' ', safe).strip()
+    safe = _UNSAFE_CHARS_RE.sub('_', name)
+    safe = _WHITESPACE_RE.sub(' ', safe).strip()
     return safe if safe else "unnamed"
 
 
@@ -40,17 +47,17 @@ def _ensure_dir(path: Path):
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _read_json(path: Path) -> Optional[dict]:
-    if path.exists():
-        with open(path, "r") as f:
-            return json.load(f)
-    return None
+def _read_json(path: Union[str, Path]) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
 
 
 def _write_json(path: Path, data: Any):
     _ensure_dir(path.parent)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+    path.write_bytes(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 
 
 # ---------------------------------------------------------------------------
@@ -59,19 +66,21 @@ def _write_json(path: Path, data: Any):
 
 def list_flows() -> list[dict]:
     """Return metadata for all saved flows."""
-    if not FLOWS_DIR.exists():
+    try:
+        with os.scandir(FLOWS_DIR) as it:
+            entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    except FileNotFoundError:
         return []
 
     result = []
-    for entry in sorted(FLOWS_DIR.iterdir()):
-        if entry.is_dir():
-            data = _read_json(entry / "flow_data.json")
-            if data:
-                result.append({
-                    "name": data.get("name", entry.name),
-                    "lastFetched": data.get("lastFetched"),
-                    "jobCount": len(data.get("pairs", [])),
-                })
+    for entry in entries:
+        data = _read_json(os.path.join(entry.path, "flow_data.json"))
+        if data:
+            result.append({
+                "name": data.get("name", entry.name),
+                "lastFetched": data.get("lastFetched"),
+                "jobCount": len(data.get("pairs", [])),
+            })
     return result
 
 
@@ -89,8 +98,7 @@ def load_flow(name: str) -> Optional[dict]:
     if not data:
         return None
 
-    data["analyzedJobs"] = list_analyzed_jobs(name)
-    data["dbxCachedJobs"] = list_dbx_cached_jobs(name)
+    data["analyzedJobs"], data["dbxCachedJobs"] = _list_flow_caches(name)
     return data
 
 
@@ -124,24 +132,24 @@ def merge_jobs(name: str, new_pairs: list, metadata: dict) -> list:
 
     # Build index of existing pairs by jobRunId
     existing_pairs = existing["pairs"]
-    index = {}
-    for pair in existing_pairs:
-        key = _pair_key(pair)
-        if key:
-            index[key] = pair
+    index = {k: p for p in existing_pairs if (k := _pair_key(p))}
 
     # Merge new pairs in
     for pair in new_pairs:
         key = _pair_key(pair)
-        if key and key in index:
+        if not key:
+            continue
+        old = index.get(key)
+        if old is not None:
             # Update status and timing fields, keep rest
-            old = index[key]
-            if pair.get("aac"):
-                old["aac"] = pair["aac"]
-            if pair.get("onprem"):
-                old["onprem"] = pair["onprem"]
+            aac = pair.get("aac")
+            if aac:
+                old["aac"] = aac
+            onprem = pair.get("onprem")
+            if onprem:
+                old["onprem"] = onprem
             old["matched"] = pair.get("matched", old.get("matched", False))
-        elif key:
+        else:
             # New job run — add it
             existing_pairs.append(pair)
             index[key] = pair
@@ -188,10 +196,15 @@ def save_dbx(name: str, job_run_id: str, data: dict):
 
 def list_dbx_cached_jobs(name: str) -> list[str]:
     """Return list of jobRunIds that have cached DBX data."""
-    dbx_dir = _flow_dir(name) / "dbx"
-    if not dbx_dir.exists():
+    return _scan_dbx_cache(_flow_dir(name))
+
+
+def _scan_dbx_cache(fdir: Path) -> list[str]:
+    try:
+        with os.scandir(fdir / "dbx") as it:
+            return [e.name[:-5] for e in it if e.name.endswith(".json")]
+    except FileNotFoundError:
         return []
-    return [p.stem for p in dbx_dir.glob("*.json")]
 
 
 def clear_dbx_job(name: str, job_run_id: str) -> bool:
@@ -228,13 +241,32 @@ def eventlog_dir(name: str, job_run_id: str) -> str:
 
 def list_analyzed_jobs(name: str) -> list[str]:
     """Return list of jobRunIds that have analysis.json."""
-    el_dir = _flow_dir(name) / "eventlogs"
-    if not el_dir.exists():
+    return _scan_analyzed(_flow_dir(name))
+
+
+def _has_analysis_file(path: str) -> bool:
+    # An empty analysis.json counts as missing, matching app.has_analysis()
+    try:
+        return os.stat(path).st_size > 0
+    except OSError:
+        return False
+
+
+def _scan_analyzed(fdir: Path) -> list[str]:
+    try:
+        with os.scandir(fdir / "eventlogs") as it:
+            return [
+                d.name for d in it
+                if d.is_dir() and _has_analysis_file(os.path.join(d.path, "analysis.json"))
+            ]
+    except FileNotFoundError:
         return []
-    return [
-        d.name for d in el_dir.iterdir()
-        if d.is_dir() and (d / "analysis.json").exists()
-    ]
+
+
+def _list_flow_caches(name: str) -> tuple[list[str], list[str]]:
+    """Return (analyzed jobRunIds, DBX-cached jobRunIds) for one flow directory."""
+    fdir = _flow_dir(name)
+    return _scan_analyzed(fdir), _scan_dbx_cache(fdir)
 
 
 # ---------------------------------------------------------------------------
@@ -2,11 +2,49 @@
 Alteryx Cloud Platform API client for Job Library data.
 """
 
+import functools
+import ssl
+
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Optional
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
 from config import Config
 
+# Upper bound on concurrent per-flow requests in get_jobs_for_flows; the
+# session's connection pool is sized to match so no request waits on a socket
+FLOW_FETCH_WORKERS = 16
+
+# Most job-library pages fetched ahead in get_all_jobs_pages
+PAGE_PREFETCH = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _unverified_ssl_context() -> ssl.SSLContext:
+    """Shared SSLContext for verify_ssl=False clients (on-prem self-signed certs)."""
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+class _SSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all reuse one prebuilt SSLContext.
+
+    Without it, urllib3 builds a fresh context for every new connection made
+    with verification disabled.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        # Set before super().__init__, which calls init_poolmanager
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self._ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
 
 class PlatformAPIError(Exception):
     """Exception raised for Platform API errors."""
@@ -28,9 +66,17 @@ class PlatformAPI:
         """
         self.token = token or Config.PLATFORM_API_TOKEN
         self.base_url = base_url or Config.PLATFORM_API_BASE_URL
+        self._job_library_url = f"{self.base_url}/jobLibrary"
         self.timeout = timeout
         self.session = requests.Session()
         self.session.verify = verify_ssl
+        pool_sizes = {"pool_connections": FLOW_FETCH_WORKERS, "pool_maxsize": FLOW_FETCH_WORKERS}
+        if verify_ssl:
+            adapter = HTTPAdapter(**pool_sizes)
+        else:
+            adapter = _SSLContextAdapter(_unverified_ssl_context(), **pool_sizes)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             "Accept": "application/json",
             "Authorization": f"Bearer {self.token}"
@@ -56,14 +102,14 @@ class PlatformAPI:
         Raises:
             PlatformAPIError: If the API request fails
         """
-        params = {
-            "limit": limit or Config.DEFAULT_LIMIT,
-            "filter": flow_name,
-            "ranfor": ranfor or Config.RANFOR_FILTER,
-            "sort": "-createdAt"
-        }
-        
-        url = f"{self.base_url}/jobLibrary?{urlencode(params)}"
+        # Same encoding urlencode() would produce, without the params dict.
+        # Defaults are read per call so a config reload applies to shared clients.
+        url = (
+            f"{self._job_library_url}?limit={quote_plus(str(limit or Config.DEFAULT_LIMIT))}"
+            f"&filter={quote_plus(flow_name)}"
+            f"&ranfor={quote_plus(ranfor or Config.RANFOR_FILTER)}"
+            "&sort=-createdAt"
+        )
         
         try:
             response = self.session.get(url, timeout=self.timeout)
@@ -85,6 +131,9 @@ class PlatformAPI:
         """
         Fetch jobs for multiple flows.
         
+        Requests are I/O-bound, so they run concurrently on a small thread
+        pool sharing this client's session; results keep the input order.
+        
         Args:
             flow_names: List of flow names to query
             limit: Maximum number of jobs per flow
@@ -93,23 +142,28 @@ class PlatformAPI:
         Returns:
             List of API responses, one per flow
         """
-        results = []
-        for flow_name in flow_names:
+        def fetch_one(flow_name: str) -> dict:
             try:
                 response = self.get_jobs_for_flow(flow_name, limit, ranfor)
-                results.append({
+                return {
                     "flow_name": flow_name,
                     "success": True,
                     "data": response
-                })
+                }
             except PlatformAPIError as e:
-                results.append({
+                return {
                     "flow_name": flow_name,
                     "success": False,
                     "error": str(e),
                     "data": None
-                })
-        return results
+                }
+
+        if len(flow_names) <= 1:
+            return [fetch_one(flow_name) for flow_name in flow_names]
+
+        workers = min(FLOW_FETCH_WORKERS, len(flow_names))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="platform-api") as pool:
+            return list(pool.map(fetch_one, flow_names))
 
     def get_all_jobs(
         self,
@@ -128,13 +182,10 @@ class PlatformAPI:
         Returns:
             (list_of_raw_jobs, has_more) — raw API entries, and whether more pages exist
         """
-        params = {
-            "limit": limit,
-            "offset": offset,
-            "sort": "-createdAt",
-        }
-
-        url = f"{self.base_url}/jobLibrary?{urlencode(params)}"
+        url = (
+            f"{self._job_library_url}?limit={quote_plus(str(limit))}"
+            f"&offset={quote_plus(str(offset))}&sort=-createdAt"
+        )
 
         try:
             response = self.session.get(url, timeout=self.timeout)
@@ -162,3 +213,44 @@ class PlatformAPI:
             return trimmed, has_more
 
         return raw_jobs, has_more
+
+    def get_all_jobs_pages(
+        self,
+        max_pages: int,
+        limit: int = 25,
+        offset: int = 0,
+        stop_at_id: Optional[int] = None,
+    ) -> tuple[list[dict], bool]:
+        """
+        Fetch up to max_pages consecutive pages of get_all_jobs.
+
+        Pages are requested in parallel windows that start at one page and
+        double up to PAGE_PREFETCH, so an incremental refresh that stops on
+        the first page costs a single request while a long drain hides most
+        of the per-page round trips. Pages are consumed in order; anything
+        fetched past the last page (or past stop_at_id) is discarded.
+
+        Returns:
+            (list_of_raw_jobs, has_more) — as for get_all_jobs
+        """
+        jobs: list[dict] = []
+        has_more = True
+        page = 0
+        window = 1
+        with ThreadPoolExecutor(max_workers=PAGE_PREFETCH, thread_name_prefix="platform-api") as pool:
+            while page < max_pages:
+                batch = range(page, min(page + window, max_pages))
+                futures = [
+                    pool.submit(self.get_all_jobs, limit, offset + p * limit, stop_at_id)
+                    for p in batch
+                ]
+                for future in futures:
+                    raw_jobs, has_more = future.result()
+                    jobs.extend(raw_jobs)
+                    if not has_more:
+                        for pending in futures:
+                            pending.cancel()
+                        return jobs, False
+                page += len(batch)
+                window = min(window * 2, PAGE_PREFETCH)
+        return jobs, has_more
@@ -0,0 +1,10 @@
+"""
+WSGI entrypoint for running Tri-Tracker under gunicorn.
+
+    gunicorn -k gthread -w 1 --threads 16 -b 0.0.0.0:5050 wsgi:application
+
+A single worker process keeps the in-memory config (updated via PUT /api/config)
+and caches consistent; request concurrency comes from the worker's threads.
+"""
+
+from app import app as application  # noqa: F401